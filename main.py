@@ -45,12 +45,14 @@ class CustomMetric(MDT.CustomMicrogridMetricBase):
     def __init__(self, mg: MDT.Microgrid, name: str, units: str=""):
         super().__init__(mg, name, units)
         self.ImprovementType = pymdt.metrics.improvement_types.maximize.value
-        self.mybus = None
+        self.handles = pymdt.metrics.entity_handles()
 
     def CustomEvaluate(self, config, installResp) -> TMO.Response:        
         MDT.PRM.PRMEvaluator.INSTANCE.EnsurePRMEvaluated(config)
         muc = config.get_ModelUpgradeConfig(self.Model)
-        bus = pymdt.results.FindCorrespondingBusFromConfig(self.mybus, config)
+        # The handles were resolved for this site in ResolveAllReferences so
+        # this is a simple lookup rather than a search by name.
+        bus = self.handles.get(config, "bus")
         
         # The microgrid realization is the place to go for most information. The
         # specification selections for any items can be found there, the
@@ -67,19 +69,15 @@ class CustomMetric(MDT.CustomMicrogridMetricBase):
         return ret
 
     def ResolveAllReferences(self):
-        if self.mybus is None: return
-        self.mybus = pymdt.results.FindCorrespondingBusFromSite(
-            self.mybus, self.Site
-            )
+        self.handles.resolve(self.Site)
 
     def Clone(self, forMG, copyUID) -> MDT.IMicrogridEntity:    
         ret = CustomMetric(forMG, self.StringID, self.Units)
         ret.CopyPropertiesFrom(self, copyUID)
-        # It's OK to just assign the return's bus to my bus.
-        # ResolveAllReferences will get called after cloning is done and the
-        # re-assignment to the corresponding bus in the new MG/Site will occur
-        # then.
-        ret.mybus = self.mybus
+        # Copy the declarations only.  ResolveAllReferences will get called
+        # after cloning is done and the corresponding bus in the new MG/Site
+        # will be found then.
+        ret.handles = self.handles.copy()
         return ret
 
 
@@ -822,7 +820,7 @@ def main():
     
     #somevalue = input("Let me know when you're ready to create the custom metric.")
     # cm = CustomMetric(mg, "Tier 0 Avail on Bus 13", "%")
-    # cm.mybus = bus12
+    # cm.handles.declare("bus", bus12)
     # cm.Limit = 92
     # cm.Objective = 100
     # mg.get_Constraints().Add(cm)
@@ -1,6 +1,8 @@
 import os
 import glob
+import json
 import subprocess
+import numpy as np
 import pymdt.utils
 import pymdt.specs
 
@@ -40,6 +42,31 @@ class powerflow_types(Enum):
     """ Indicates that DC powerflow calculations should be conducted.
     """
 
+class stored_data_types(Enum):
+    """ An enumeration of the kinds of stored data configurations that are kept
+    in the MDT stored data directories.
+    """
+
+    load = 0
+    """ Stored electrical load profiles.
+    """
+
+    thermal = 1
+    """ Stored thermal load profiles.
+    """
+
+    solar = 2
+    """ Stored solar resource profiles.
+    """
+
+    wind = 3
+    """ Stored wind resource profiles.
+    """
+
+    hydro = 4
+    """ Stored hydro resource profiles.
+    """
+
 class details:
     
     StoredLoadProfiles = []
@@ -47,6 +74,26 @@ class details:
     StoredWindProfiles = []
     StoredHydroProfiles = []
     StoredThermalProfiles = []
+
+    PROFILE_CATALOG_FILE = "pymdt_profile_catalog.json"
+    PROFILE_CATALOG_VERSION = 1
+
+    # Keyed on stored data directory.  Each value is the dictionary of catalog
+    # entries (keyed on file name) last read from or written to that directory.
+    _profile_catalogs = {}
+
+    _stored_data_dirs = {
+        stored_data_types.load:
+            lambda: MDT.Driver.INSTANCE.MakeLoadDataDirectory(),
+        stored_data_types.thermal:
+            lambda: MDT.Driver.INSTANCE.MakeThermalLoadDataDirectory(),
+        stored_data_types.solar:
+            lambda: MDT.Driver.INSTANCE.MakeSolarDataDirectory(),
+        stored_data_types.wind:
+            lambda: MDT.Driver.INSTANCE.MakeWindDataDirectory(),
+        stored_data_types.hydro:
+            lambda: MDT.Driver.INSTANCE.MakeHydroDataDirectory()
+        }
         
     @staticmethod
     def _load_all_stored_configs(pth, list, ext="*.msrd"):
@@ -111,6 +158,11 @@ class details:
             if not pymdt.utils.details._is_collection(specentry):
                 specentry = [specentry]
             specs = details._resolve_all_specs(specentry, all_specs, **kwargs)
+            prune = kwargs.get("prune_dominated", False)
+            if prune:
+                specs = pymdt.specs.PruneDominated(
+                    specs, None if prune is True else prune
+                    )
             for spec in specs:
                 pymdt.utils.details._execute_1_arg_add_with_undo(
                     node, "AddSpecificationCanceled", "get_Specifications",
@@ -747,7 +799,177 @@ class details:
         ar.WriteFormatted(fmt, fStr)
         fStr.Close()
         return stDat
-    
+
+    @staticmethod
+    def _expected_num_periods(rpd) -> int:
+        # Returns None if the period and interval of rpd are not available or
+        # not usable.
+        try:
+            per_hrs = rpd.Period * \
+                pymdt.utils.details._time_units_to_hours(rpd.PeriodUnits)
+            int_hrs = rpd.Interval * \
+                pymdt.utils.details._time_units_to_hours(rpd.IntervalUnits)
+        except (AttributeError, ValueError, TypeError):
+            return None
+        if per_hrs <= 0.0 or int_hrs <= 0.0: return None
+        return int(round(int_hrs / per_hrs))
+
+    @staticmethod
+    def _describe_indices(idx: np.ndarray, limit: int = 10) -> str:
+        ret = ", ".join(str(i) for i in idx[:limit].tolist())
+        if idx.size > limit: ret += " and " + str(idx.size - limit) + " more"
+        return ret
+
+    @staticmethod
+    def _validate_regular_period_data(rpd, values: np.ndarray, **kwargs):
+        subject = "the dataset" if rpd is None else \
+            "the dataset for " + rpd.GetTypeAndIDString()
+
+        errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
+        if rpd is not None and kwargs.get("check_length", True):
+            expected = details._expected_num_periods(rpd)
+            if expected is not None and values.size != expected:
+                msg = "Length mismatch in " + subject + ".  " + \
+                    str(values.size) + " values were provided but the " + \
+                    "period and interval call for " + str(expected) + "."
+                if kwargs.get("strict", False): raise ValueError(msg)
+                errLog.AddEntry(Common.Logging.LogCategories.Warning, msg)
+
+        bad = np.flatnonzero(~np.isfinite(values))
+        if bad.size > 0:
+            raise ValueError(
+                "Non-finite values in " + subject + " at indices " +
+                details._describe_indices(bad) + "."
+                )
+
+        if "value_bounds" in kwargs:
+            lo, hi = kwargs["value_bounds"]
+        else:
+            lo, hi = 0.0, None
+            # Solar data is normally a fraction of peak irradiance but
+            # measured data commonly exceeds 1 slightly so only warn.
+            if rpd is not None and isinstance(rpd, MDT.SolarResource):
+                over = np.flatnonzero(values > 1.0)
+                if over.size > 0:
+                    errLog.AddEntry(
+                        Common.Logging.LogCategories.Warning,
+                        "Values above 1 in " + subject + " at indices " +
+                        details._describe_indices(over) + "."
+                        )
+
+        if lo is not None:
+            bad = np.flatnonzero(values < lo)
+            if bad.size > 0:
+                raise ValueError(
+                    "Values below " + str(lo) + " in " + subject +
+                    " at indices " + details._describe_indices(bad) + "."
+                    )
+        if hi is not None:
+            bad = np.flatnonzero(values > hi)
+            if bad.size > 0:
+                raise ValueError(
+                    "Values above " + str(hi) + " in " + subject +
+                    " at indices " + details._describe_indices(bad) + "."
+                    )
+
+    @staticmethod
+    def _compute_profile_statistics(fname: str) -> dict:
+        stc = MDT.StoredTierLoadConfiguration(fname)
+        stc.LoadConfigurationData()
+        data = GetRegularPeriodData(stc)
+        per_hrs = stc.Period * \
+            pymdt.utils.details._time_units_to_hours(stc.PeriodUnits)
+        int_hrs = stc.Interval * \
+            pymdt.utils.details._time_units_to_hours(stc.IntervalUnits)
+
+        peak = float(data.max()) if data.size > 0 else 0.0
+        mean = float(data.mean()) if data.size > 0 else 0.0
+        energy = float(data.sum()) * per_hrs
+
+        return {
+            "name": stc.StringID,
+            "tier": "" if stc.LoadTier is None else stc.LoadTier.StringID,
+            "count": int(data.size),
+            "period_hours": per_hrs,
+            "interval_hours": int_hrs,
+            "peak": peak,
+            "minimum": float(data.min()) if data.size > 0 else 0.0,
+            "mean": mean,
+            "energy": energy,
+            "annual_energy":
+                energy * (8760.0 / int_hrs) if int_hrs > 0.0 else energy,
+            "load_factor": mean / peak if peak > 0.0 else 0.0,
+            "zero_fraction":
+                float(np.count_nonzero(data == 0.0)) / data.size \
+                    if data.size > 0 else 0.0
+            }
+
+    @staticmethod
+    def _read_profile_catalog(cat_file: str) -> dict:
+        try:
+            with open(cat_file, "r") as fp:
+                cat = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        if cat.get("version") != details.PROFILE_CATALOG_VERSION: return {}
+        return cat.get("entries", {})
+
+    @staticmethod
+    def _write_profile_catalog(cat_file: str, entries: dict, **kwargs):
+        # Write to a temporary file and swap it in so that a reader never sees
+        # a partially written catalog.
+        tmp_file = cat_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as fp:
+                json.dump(
+                    {
+                        "version": details.PROFILE_CATALOG_VERSION,
+                        "entries": entries
+                    }, fp, indent=1
+                    )
+            os.replace(tmp_file, cat_file)
+        except OSError as e:
+            errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
+            errLog.AddEntry(
+                Common.Logging.LogCategories.Warning,
+                "Unable to write the stored profile catalog " + cat_file +
+                ". The statistics will be recomputed next session. " + str(e)
+                )
+
+    @staticmethod
+    def _refresh_profile_catalog(kind, **kwargs) -> dict:
+        if type(kind) is str: kind = stored_data_types[kind]
+        pth = details._stored_data_dirs[kind]()
+        cat_file = os.path.join(pth, details.PROFILE_CATALOG_FILE)
+
+        old = details._profile_catalogs.get(pth)
+        if old is None: old = details._read_profile_catalog(cat_file)
+
+        entries = {}
+        changed = False
+        for fname in glob.iglob(os.path.join(pth, "*.msrd")):
+            key = os.path.basename(fname)
+            try:
+                mtime = os.path.getmtime(fname)
+                ent = old.get(key)
+                if ent is None or ent.get("mtime") != mtime:
+                    ent = details._compute_profile_statistics(fname)
+                    ent["mtime"] = mtime
+                    changed = True
+            except (SYSEX, Exception) as e:
+                errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
+                errLog.AddEntry(
+                    Common.Logging.LogCategories.Warning,
+                    "Could not read stored profile " + fname + ": " + str(e)
+                    )
+                continue
+            entries[key] = ent
+
+        if changed or len(entries) != len(old):
+            details._write_profile_catalog(cat_file, entries, **kwargs)
+        details._profile_catalogs[pth] = entries
+        return entries
+
 details._load_all_stored_configs(
     MDT.Driver.INSTANCE.MakeLoadDataDirectory(), details.StoredLoadProfiles
     )
@@ -870,6 +1092,142 @@ def FindStoredThermalConfiguration(name: str) -> MDT.StoredTierLoadConfiguration
         find_context="stored thermal data configurations"
         )
 
+def GetStoredProfileStatistics(kind: stored_data_types, name: str=None, **kwargs):
+    """ Returns the precomputed statistics of the stored profiles of the
+    supplied kind without loading any of the profile data.
+
+    The statistics are kept in a catalog file (pymdt_profile_catalog.json)
+    in each stored data directory.  An entry is computed the first time a
+    stored data file is seen and is recomputed only when the modification time
+    of the file changes.  Entries for deleted files are dropped.
+
+    Each entry is a dictionary with the following keys:
+
+        name: str
+            The name of the stored configuration.  This is the name to supply
+            as the stored_configuration argument of functions such as
+            MakeLoadDataTier and MakeSolarResource.
+        tier: str
+            The name of the load tier of the stored configuration or an empty
+            string if it has none.
+        count: int
+            The number of data points in the profile.
+        period_hours: float
+            The time between data points in hours.
+        interval_hours: float
+            The total duration of the profile in hours.
+        peak, minimum, mean: float
+            The largest, smallest, and average data values.
+        energy: float
+            The sum of the data values times the period in hours.  For a load
+            profile in kW, this is the energy in kWh over the interval.
+        annual_energy: float
+            The energy scaled to a duration of 1 year (8760 hours).
+        load_factor: float
+            The ratio of the mean to the peak value (0.0 if the peak is 0).
+        zero_fraction: float
+            The fraction of data points that are exactly 0.
+
+    Parameters
+    ----------
+    kind: stored_data_types
+        The kind of stored profiles for which to get statistics.  This can be
+        a member of the stored_data_types enumeration or the name of one.
+    name: str
+        The name of a single stored profile whose statistics are sought.  If
+        this is None (the default), the statistics of all stored profiles of
+        the supplied kind are returned.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        err_log: Common.Logging.Log
+            A Log object into which to capture any messages generated while
+            refreshing the catalog.  If not provided, messages will be added
+            into the pymdt.GlobalErrorLog.
+
+    Returns
+    -------
+    list or dict:
+        If no name is supplied, a list of the statistics entries of all stored
+        profiles sorted by name.  Otherwise, the single entry for the named
+        profile or None if there is no such profile.
+    """
+    entries = details._refresh_profile_catalog(kind, **kwargs)
+    if name is not None:
+        ent = next((e for e in entries.values() if e["name"] == name), None)
+        return None if ent is None else dict(ent)
+    return sorted((dict(e) for e in entries.values()), key=lambda e: e["name"])
+
+def QueryStoredProfiles(kind: stored_data_types, **kwargs) -> list:
+    """ Finds the stored profiles of the supplied kind whose precomputed
+    statistics satisfy all of the supplied criteria.
+
+    No profile data is loaded to answer a query.  See
+    GetStoredProfileStatistics for a description of the catalog and of the
+    available statistics.  For example, the following finds all load profiles
+    with a peak between 200 and 400 kW in the Critical tier:
+
+    .. code-block:: python
+
+        QueryStoredProfiles(
+            stored_data_types.load, peak=(200, 400), tier="Critical"
+            )
+
+    Parameters
+    ----------
+    kind: stored_data_types
+        The kind of stored profiles to search.  This can be a member of the
+        stored_data_types enumeration or the name of one.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        tier: str
+            The name of the load tier that the stored profiles must have.  The
+            comparison is not case sensitive.
+        <statistic>: tuple[float,float]
+            The inclusive (lower, upper) range into which the named statistic
+            must fall.  The names are those of the numeric statistics such as
+            peak, annual_energy, load_factor, and zero_fraction.  Either bound
+            may be None in which case that side of the range is open.
+        sort_by: str
+            The name of a statistic by which to sort the results.  The default
+            is to sort by name.
+        descending: bool
+            Whether to sort in descending order.  The default is False.
+        err_log: Common.Logging.Log
+            A Log object into which to capture any messages generated while
+            refreshing the catalog.  If not provided, messages will be added
+            into the pymdt.GlobalErrorLog.
+
+    Returns
+    -------
+    list:
+        The statistics entries (dictionaries) of all matching stored profiles.
+    """
+    ents = GetStoredProfileStatistics(kind, **kwargs)
+    tier = kwargs.get("tier")
+    if tier is not None:
+        if not isinstance(tier, str): tier = tier.StringID
+        ents = [e for e in ents if e["tier"].casefold() == tier.casefold()]
+
+    reserved = ("tier", "sort_by", "descending", "err_log")
+    for key, rng in kwargs.items():
+        if key in reserved: continue
+        if ents and key not in ents[0]:
+            raise KeyError("Unknown stored profile statistic " + key)
+        lo, hi = rng
+        ents = [
+            e for e in ents if (lo is None or e[key] >= lo) and
+                (hi is None or e[key] <= hi)
+            ]
+
+    return sorted(
+        ents, key=lambda e: e[kwargs.get("sort_by", "name")],
+        reverse=kwargs.get("descending", False)
+        )
+
 def MakeStoredLoadConfiguration(name: str, **kwargs) -> MDT.StoredTierLoadConfiguration:
     """ This helper function creates a new file containing load data information
     and makes it available for use in any models.
@@ -1181,6 +1539,9 @@ def MakeLine(mg: MDT.Microgrid, name: str, fn, sn, **kwargs) -> MDT.Line:
             can either be provided as an MDT.LineSpec object or as the
             name of the specification to use in which case a search of the
             master list will be conducted to find and assign the correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         length: float
             A value that is greater than or equal to 0 to be the length of the
             new line (ft).
@@ -1260,6 +1621,9 @@ def MakeTransformer(mg: MDT.Microgrid, name: str, **kwargs) -> MDT.Transformer:
             object or as the name of the specification to use in which case a
             search of the master list will be conducted to find and assign the
             correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new transformer. 
             This is typically used when the new transformer is being created for
@@ -1340,6 +1704,9 @@ def MakeSwitch(mg: MDT.Microgrid, name: str, **kwargs) -> MDT.Switch:
             or as the name of the specification to use in which case a search of
             the master list will be conducted to find and assign the correct
             spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new switch. 
             This is typically used when the new switch is being created for
@@ -1592,6 +1959,9 @@ def MakeDieselTank(mg: MDT.Microgrid, name: str, **kwargs) -> MDT.DieselTank:
             as the name of the specification to use in which case a search of
             the master list will be conducted to find and assign the correct
             spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new tank. This
             is typically used when the new tank is being created for a microgrid
@@ -1668,6 +2038,9 @@ def MakePropaneTank(mg: MDT.Microgrid, name: str, **kwargs) -> MDT.PropaneTank:
             as the name of the specification to use in which case a search of
             the master list will be conducted to find and assign the correct
             spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new tank. This is
             typically used when the new tank is being created for a microgrid
@@ -1743,6 +2116,9 @@ def MakeDieselGenerator(b: MDT.Bus, name: str, **kwargs) -> MDT.DieselGenerator:
             MDT.DieselGeneratorSpec object or as the name of the
             specification to use in which case a search of the master list will
             be conducted to find and assign the correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new diesel
             generator.  This is typically used when the new diesel generator is
@@ -1830,6 +2206,9 @@ def MakeBattery(b: MDT.Bus, name: str, **kwargs) -> MDT.Battery:
             or as the name of the specification to use in which case a search of
             the master list will be conducted to find and assign the correct
             spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new battery.
             This is typically used when the new battery is being created for a
@@ -1982,6 +2361,9 @@ def MakeUPS(b: MDT.Bus, name: str, **kwargs) -> MDT.UninterruptiblePowerSupply:
             or as the name of the specification to use in which case a search of
             the master list will be conducted to find and assign the correct
             spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new UPS.
             This is typically used when the new UPS is being created for a
@@ -2065,6 +2447,9 @@ def MakePropaneGenerator(b: MDT.Bus, name: str, **kwargs) -> MDT.PropaneGenerato
             MDT.PropaneGeneratorSpec object or as the name of the
             specification to use in which case a search of the master list will
             be conducted to find and assign the correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new propane
             generator.  This is typically used when the new propane generator is
@@ -2153,6 +2538,9 @@ def MakeNaturalGasGenerator(b: MDT.Bus, name: str, **kwargs) -> MDT.NaturalGasGe
             MDT.NaturalGasGeneratorSpec object or as the name of the
             specification to use in which case a search of the master list will
             be conducted to find and assign the correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new natural gas
             generator.  This is typically used when the new natural gas
@@ -2234,6 +2622,9 @@ def MakeSolarGenerator(b: MDT.Bus, name: str, **kwargs) -> MDT.SolarGenerator:
             MDT.SolarGeneratorSpec object or as the name of the
             specification to use in which case a search of the master list will
             be conducted to find and assign the correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new solar
             generator.  This is typically used when the new solar generator is
@@ -2318,6 +2709,9 @@ def MakeWindGenerator(b: MDT.Bus, name: str, **kwargs) -> MDT.WindGenerator:
             object or as the name of the specification to use in which case a
             search of the master list will be conducted to find and assign the
             correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new wind
             generator.  This is typically used when the new wind generator is
@@ -2402,6 +2796,9 @@ def MakeHydroGenerator(b: MDT.Bus, name: str, **kwargs) -> MDT.HydroGenerator:
             MDT.HydroGeneratorSpec object or as the name of the
             specification to use in which case a search of the master list will
             be conducted to find and assign the correct spec.
+        prune_dominated:
+            Whether and how to prune the specs.  See
+            pymdt.specs.PruneDominated.
         owner:
             An optional parameter to serve as the owner of the new hydro
             generator.  This is typically used when the new hydro generator is
@@ -2801,29 +3198,41 @@ def MakeLoadDataTier(lc: MDT.ILoadContainer, name: str, **kwargs) -> MDT.LoadDat
             https://learn.microsoft.com/en-us/dotnet/api/system.guid.-ctor?view=net-8.0#system-guid-ctor(system-string)
             or a System.Guid instance.  If not provided, a newly created,
             random Guid is used.
+        check_length: bool
+            Whether or not the number of values in data is checked.  If not
+            provided, the data is checked against the owner when there is one
+            and against the period and interval of the new data set otherwise.
+            Pass False to skip the check entirely.
+        strict: bool
+            If True, a length mismatch raises a ValueError rather than logging
+            a warning.  The default is False.
         
     Returns
     -------
     MDT.LoadDataWithTier:
         The newly created solar load data instance.
     """
-    ldwt = details.build_load_data_with_tier(lc, name, **kwargs)
     owner = details._extract_owner(lc, **kwargs)
+    # The length of the data is checked against the owner below.
+    checkLength = kwargs.get("check_length", True)
+    ldwt = details.build_load_data_with_tier(
+        lc, name,
+        **{**kwargs, "check_length": kwargs.get("check_length", owner is None)}
+        )
     if owner is not None:
-        if "data" in kwargs:
+        if "data" in kwargs and checkLength:
             dataset = kwargs["data"]
             if not pymdt.utils.details._is_collection(dataset): dataset = [dataset]
             
             if len(dataset) != owner.get_NumTimePeriods():
-                errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
-                errLog.AddEntry(
-                    Common.Logging.LogCategories.Warning,
-                    "A dataset with " +
-                    Common.Util.UtilFuncs.MakePluralPhrase("entry", len(dataset), False, True) +
-                    " was provided for " + owner.GetTypeAndIDString() + " that houses " +
-                    Common.Util.UtilFuncs.MakePluralPhrase("entry", owner.get_NumTimePeriods(), False, True) +
+                msg = "A dataset with " + \
+                    Common.Util.UtilFuncs.MakePluralPhrase("entry", len(dataset), False, True) + \
+                    " was provided for " + owner.GetTypeAndIDString() + " that houses " + \
+                    Common.Util.UtilFuncs.MakePluralPhrase("entry", owner.get_NumTimePeriods(), False, True) + \
                     "."
-                    )
+                if kwargs.get("strict", False): raise ValueError(msg)
+                errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
+                errLog.AddEntry(Common.Logging.LogCategories.Warning, msg)
         
         pymdt.utils.details._execute_1_arg_add_with_undo(
             owner, "AddLoadDataSetCanceled", "get_LoadDataSets", ldwt, **kwargs
@@ -3413,15 +3822,101 @@ def ResetRegularPeriodData(rpd: MDT.IRegularPeriodData, dataset, **kwargs):
         undos: Common.Undoing.IUndoPack
             An optional undo pack into which to load the undoable objects
             generated during this operation (if any).
+        validate: bool
+            Whether or not to check the data before it is handed to the MDT.
+            If True, which is the default, a ValueError is raised identifying
+            the offending indices if the data contains non-finite values or
+            values outside of the value_bounds.  A warning is logged if the
+            number of values does not match the period and interval of rpd.
+        check_length: bool
+            Whether or not validation compares the number of values to the
+            period and interval of rpd.  The default is True.  Callers that
+            have already checked the length pass False.
+        strict: bool
+            If True, a length mismatch found during validation raises a
+            ValueError rather than logging a warning.  The default is False.
+        value_bounds: tuple
+            A (low, high) pair of bounds used during validation.  Either may be
+            None to leave that side unbounded.  The default is (0, None).  For
+            solar resources, values above 1 are additionally reported as
+            warnings unless bounds are supplied; pass (0, 1) to reject them.
+
+    Returns
+    -------
+    Common.Databinding.ObservableBindingListWithUndo[float]:
+        The list of values that was created from the supplied data set.
     """
-    dat = Common.Databinding.ObservableBindingListWithUndo[float]()
-    if not pymdt.utils.details._is_collection(dataset): dataset = [dataset]
-    for d in dataset: dat.Add(float(d))
+    values = pymdt.utils.details._as_float_array(dataset)
+    if kwargs.get("validate", True):
+        details._validate_regular_period_data(rpd, values, **kwargs)
+
+    dat = pymdt.utils.details._array_to_net_list(
+        values, Common.Databinding.ObservableBindingListWithUndo[float]()
+        )
     if rpd is not None:
         pymdt.utils.details._execute_loggable_property_set_with_undo(
             rpd, "LoadDataList", dat, **kwargs
             )
+    return dat
     
+def GetRegularPeriodData(rpd) -> np.ndarray:
+    """ Reads the data of the supplied regular period data instance or stored
+    configuration into a numpy array.
+
+    The values are moved across the interop boundary in bulk rather than one
+    element at a time so this is much faster than iterating the LoadDataList
+    from python.
+
+    Parameters
+    ----------
+    rpd
+        The MDT.IRegularPeriodData (load data tier, solar resource, etc.) or
+        MDT.StoredTierLoadConfiguration whose data is to be read.  For stored
+        configurations, the configuration data must already be loaded.
+
+    Returns
+    -------
+    numpy.ndarray:
+        A new 1-D float64 array holding a copy of the data.
+    """
+    lst = rpd.LoadDataList if hasattr(rpd, "LoadDataList") else rpd.LoadData
+    return pymdt.utils.details._net_list_to_array(lst)
+
+def GetRegularPeriodDataBatch(rpds, **kwargs) -> np.ndarray:
+    """ Reads the data of many regular period data instances or stored
+    configurations into a single 2-D numpy array.
+
+    Parameters
+    ----------
+    rpds: iterable
+        The MDT.IRegularPeriodData or MDT.StoredTierLoadConfiguration instances
+        whose data is to be read.  See GetRegularPeriodData.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        fill: float
+            The value used to pad rows whose data is shorter than the longest
+            data set.  The default is NaN.
+
+    Returns
+    -------
+    numpy.ndarray:
+        A float64 array with one row per supplied instance and as many columns
+        as the longest data set.
+    """
+    if not pymdt.utils.details._is_collection(rpds): rpds = [rpds]
+    lsts = [
+        r.LoadDataList if hasattr(r, "LoadDataList") else r.LoadData
+        for r in rpds
+        ]
+    n = max((0 if l is None else l.Count for l in lsts), default=0)
+    out = np.full((len(lsts), n), kwargs.get("fill", np.nan), dtype=np.float64)
+    for i, l in enumerate(lsts):
+        c = 0 if l is None else l.Count
+        pymdt.utils.details._net_list_to_array(l, out[i, :c])
+    return out
+
 def ConfigureMicrogridController(mg: MDT.Microgrid, **kwargs):
     """ Sets the type and properties of the controller that controls islanded
     microgrid operations (as opposed to startup or grid-tied behavior.)
@@ -1,8 +1,364 @@
+import math
+
+import numpy as np
+
+import System
 import MDT
 import Common
 import Common.Distributions as CD
 
-def MakeExponential(mean: float, location: float=0.0) -> CD.Exponential:
+class fit_result:
+    """ The result of fitting one distribution family to a set of samples.
+    """
+
+    def __init__(self, family: str, params: dict, log_likelihood: float, aic: float, ks_statistic: float, distribution):
+        self.family = family
+        """ The name of the fitted family.
+        """
+
+        self.params = params
+        """ The fitted parameters by the argument names of the Make* function
+        of the family.
+        """
+
+        self.log_likelihood = log_likelihood
+        """ The log likelihood of the samples under the fitted distribution.
+        """
+
+        self.aic = aic
+        """ The Akaike information criterion of the fit.  Lower is better.
+        """
+
+        self.ks_statistic = ks_statistic
+        """ The Kolmogorov-Smirnov statistic of the fit, the largest distance
+        between the empirical and fitted cumulative distribution functions.
+        """
+
+        self.distribution = distribution
+        """ The fitted distribution built by the Make* function of the family.
+        """
+
+    def __str__(self):
+        return (
+            self.family + "(" + ", ".join(
+                k + "=" + "{:.6g}".format(v) for k, v in self.params.items()
+                ) + "): AIC=" + "{:.6g}".format(self.aic) + ", KS=" +
+            "{:.4f}".format(self.ks_statistic)
+            )
+
+class details:
+
+    # The family and parameters of the distributions built by this module
+    # keyed by distribution object.  Used to draw samples with NumPy.  The
+    # wrappers pythonnet creates for the same .NET object hash and compare
+    # equal so a distribution read back from the model is found as well.
+    # The entries are released whenever new inputs are loaded.
+    _dist_params = {}
+
+    # Shared distributions keyed by family and parameters along with the
+    # number of times each family was requested and served from the cache.
+    # The distributions are released whenever new inputs are loaded.
+    _interned = {}
+    _intern_requests = {}
+    _intern_reuses = {}
+
+    @staticmethod
+    def _register(dist, family: str, *params):
+        details._dist_params[dist] = (family, params)
+        return dist
+
+    @staticmethod
+    def _make(family: str, factory, intern: bool, *params):
+        if not intern: return details._register(factory(), family, *params)
+        key = (family, tuple(float(p) for p in params))
+        details._intern_requests[family] = \
+            details._intern_requests.get(family, 0) + 1
+        ret = details._interned.get(key)
+        if ret is not None:
+            details._intern_reuses[family] = \
+                details._intern_reuses.get(family, 0) + 1
+            return ret
+        ret = details._interned[key] = \
+            details._register(factory(), family, *params)
+        return ret
+
+    @staticmethod
+    def _release_distributions():
+        details._interned.clear()
+        details._dist_params.clear()
+
+    @staticmethod
+    def _sample_triangular(rng, n, lower, mode, upper):
+        if upper <= lower: return np.full(n, float(lower))
+        return rng.triangular(lower, mode, upper, n)
+
+    @staticmethod
+    def _sample_discrete(rng, n, values, prob, alias):
+        return values[details._sample_alias(rng, n, prob, alias)]
+
+    @staticmethod
+    def _sample_placement(rng, n, init, subseq):
+        if n == 0: return np.empty(0)
+        ret = np.empty(n)
+        ret[:1] = details._sample(init, 1, rng)
+        ret[1:] = details._sample(subseq, n - 1, rng)
+        return ret
+
+    # NumPy equivalents of the distribution families by name.  Each takes the
+    # generator, the number of draws and the parameters recorded at creation.
+    _samplers = {
+        "exponential": lambda rng, n, mean, loc: loc + rng.exponential(mean, n),
+        "normal": lambda rng, n, mean, sd: rng.normal(mean, sd, n),
+        "uniform": lambda rng, n, lo, hi: rng.uniform(lo, hi, n),
+        "fixed": lambda rng, n, val: np.full(n, float(val)),
+        "lognormal": lambda rng, n, loc, scale: rng.lognormal(loc, scale, n),
+        "cauchy": lambda rng, n, loc, scale: \
+            loc + scale * rng.standard_cauchy(n),
+        "binomial": lambda rng, n, trials, p: \
+            rng.binomial(int(trials), p, n).astype(float),
+        "bernoulli": lambda rng, n, p: rng.binomial(1, p, n).astype(float),
+        "gamma": lambda rng, n, shape, scale: rng.gamma(shape, scale, n),
+        "poisson": lambda rng, n, mean: rng.poisson(mean, n).astype(float),
+        "triangular": lambda rng, n, lo, mode, hi: \
+            details._sample_triangular(rng, n, lo, mode, hi),
+        "discrete": lambda rng, n, vals, prob, alias: \
+            details._sample_discrete(rng, n, vals, prob, alias),
+        "placement": lambda rng, n, init, subseq: \
+            details._sample_placement(rng, n, init, subseq)
+        }
+
+    @staticmethod
+    def _weights_to_probabilities(weights, what: str) -> np.ndarray:
+        w = np.asarray(weights, dtype=float).ravel()
+        if w.size == 0:
+            raise ValueError("No " + what + " were supplied.")
+        if not np.all(np.isfinite(w)) or np.any(w < 0.0):
+            raise ValueError(
+                "The " + what + " must be finite and non-negative."
+                )
+        total = w.sum()
+        if total <= 0.0:
+            raise ValueError("The " + what + " must not all be zero.")
+        return w / total
+
+    @staticmethod
+    def _build_alias_table(probs: np.ndarray) -> tuple:
+        # Vose's method.  Each column i holds its own index with probability
+        # prob[i] and alias[i] otherwise so a draw needs one uniform index and
+        # one uniform value.
+        n = probs.size
+        scaled = probs * n
+        prob = np.ones(n)
+        alias = np.arange(n)
+        small = np.flatnonzero(scaled < 1.0).tolist()
+        large = np.flatnonzero(scaled >= 1.0).tolist()
+        scaled = scaled.tolist()
+        while small and large:
+            s = small.pop()
+            l = large[-1]
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+        return prob, alias
+
+    @staticmethod
+    def _sample_alias(rng, n: int, prob: np.ndarray, alias: np.ndarray) -> np.ndarray:
+        idx = rng.integers(0, prob.size, n)
+        return np.where(rng.random(n) < prob[idx], idx, alias[idx])
+
+    @staticmethod
+    def _erf(x: np.ndarray) -> np.ndarray:
+        # Abramowitz and Stegun 7.1.26.  Accurate to about 1.5e-7 which is
+        # plenty for a goodness of fit statistic.
+        t = 1.0 / (1.0 + 0.3275911 * np.abs(x))
+        y = 1.0 - t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 +
+            t * (-1.453152027 + t * 1.061405429)))) * np.exp(-x * x)
+        return np.copysign(y, x)
+
+    @staticmethod
+    def _normal_cdf(x: np.ndarray, mu: float, sigma: float) -> np.ndarray:
+        return 0.5 * (1.0 + details._erf((x - mu) / (sigma * math.sqrt(2.0))))
+
+    @staticmethod
+    def _gamma_cdf(x: np.ndarray, shape: float, scale: float) -> np.ndarray:
+        # The regularized lower incomplete gamma function using its series
+        # below shape+1 and its continued fraction above.
+        z = np.maximum(x / scale, 0.0)
+        ret = np.zeros_like(z)
+        norm = shape * np.log(np.where(z > 0.0, z, 1.0)) - z - \
+            math.lgamma(shape)
+        lo = (z > 0.0) & (z < shape + 1.0)
+        if np.any(lo):
+            zl = z[lo]
+            term = np.full_like(zl, 1.0 / shape)
+            total = term.copy()
+            for k in range(1, 500):
+                term *= zl / (shape + k)
+                total += term
+                if np.all(term < total * 1e-12): break
+            ret[lo] = total * np.exp(norm[lo])
+        hi = z >= shape + 1.0
+        if np.any(hi):
+            zh = z[hi]
+            tiny = 1e-300
+            b = zh + 1.0 - shape
+            c = np.full_like(zh, 1.0 / tiny)
+            d = 1.0 / b
+            h = d.copy()
+            for k in range(1, 500):
+                an = -k * (k - shape)
+                b += 2.0
+                d = an * d + b
+                d = np.where(np.abs(d) < tiny, tiny, d)
+                c = b + an / c
+                c = np.where(np.abs(c) < tiny, tiny, c)
+                d = 1.0 / d
+                delta = d * c
+                h *= delta
+                if np.all(np.abs(delta - 1.0) < 1e-12): break
+            ret[hi] = 1.0 - np.exp(norm[hi]) * h
+        return np.clip(ret, 0.0, 1.0)
+
+    @staticmethod
+    def _digamma(x: float) -> float:
+        ret = 0.0
+        while x < 6.0:
+            ret -= 1.0 / x
+            x += 1.0
+        f = 1.0 / (x * x)
+        return ret + math.log(x) - 0.5 / x - f * (1.0/12.0 - f * (1.0/120.0 -
+            f * (1.0/252.0 - f * (1.0/240.0 - f / 132.0))))
+
+    @staticmethod
+    def _trigamma(x: float) -> float:
+        ret = 0.0
+        while x < 6.0:
+            ret += 1.0 / (x * x)
+            x += 1.0
+        f = 1.0 / (x * x)
+        return ret + 1.0 / x + f / 2.0 + f / x * (1.0/6.0 - f * (1.0/30.0 -
+            f * (1.0/42.0 - f / 30.0)))
+
+    @staticmethod
+    def _fit_exponential(x: np.ndarray, n: int) -> tuple:
+        mean = x.mean()
+        ll = -n * math.log(mean) - n
+        cdf = 1.0 - np.exp(-x / mean)
+        return {"mean": mean}, ll, cdf
+
+    @staticmethod
+    def _fit_normal(x: np.ndarray, n: int) -> tuple:
+        mu, sd = x.mean(), x.std()
+        ll = -0.5 * n * (math.log(2.0 * math.pi * sd * sd) + 1.0)
+        return {"mean": mu, "std_dev": sd}, ll, details._normal_cdf(x, mu, sd)
+
+    @staticmethod
+    def _fit_lognormal(x: np.ndarray, n: int) -> tuple:
+        lx = np.log(x)
+        mu, sd = lx.mean(), lx.std()
+        ll = -0.5 * n * (math.log(2.0 * math.pi * sd * sd) + 1.0) - lx.sum()
+        return (
+            {"location": mu, "scale": sd}, ll,
+            details._normal_cdf(lx, mu, sd)
+            )
+
+    @staticmethod
+    def _fit_gamma(x: np.ndarray, n: int) -> tuple:
+        mean = x.mean()
+        mlog = np.log(x).mean()
+        s = math.log(mean) - mlog
+        # Minka's starting point followed by Newton's method on the shape.
+        k = (3.0 - s + math.sqrt((s - 3.0)**2 + 24.0 * s)) / (12.0 * s)
+        for _ in range(50):
+            step = (math.log(k) - details._digamma(k) - s) / \
+                (1.0 / k - details._trigamma(k))
+            k = max(k - step, k * 0.5)
+            if abs(step) < 1e-10 * k: break
+        theta = mean / k
+        ll = n * ((k - 1.0) * mlog - mean / theta - k * math.log(theta) -
+            math.lgamma(k))
+        return (
+            {"shape": k, "scale": theta}, ll, details._gamma_cdf(x, k, theta)
+            )
+
+    @staticmethod
+    def _fit_uniform(x: np.ndarray, n: int) -> tuple:
+        lo, hi = x[0], x[-1]
+        return (
+            {"lower": lo, "upper": hi}, -n * math.log(hi - lo),
+            (x - lo) / (hi - lo)
+            )
+
+    @staticmethod
+    def _fit_triangular(x: np.ndarray, n: int) -> tuple:
+        # The bounds are widened slightly past the extreme samples so that
+        # they have non-zero likelihood.  The most likely mode is one of the
+        # samples and is found by evaluating the likelihood at all of them
+        # at once using cumulative sums.
+        pad = (x[-1] - x[0]) / (n - 1)
+        a, b = x[0] - pad, x[-1] + pad
+        la = np.concatenate(([0.0], np.cumsum(np.log(x - a))))
+        lb = np.concatenate((np.cumsum(np.log(b - x)[::-1])[::-1], [0.0]))
+        k = np.arange(n)
+        ll = la[k] + lb[k] - k * np.log(x - a) - (n - k) * np.log(b - x) + \
+            n * math.log(2.0 / (b - a))
+        i = int(np.argmax(ll))
+        c = x[i]
+        cdf = np.where(
+            x < c, (x - a)**2 / ((b - a) * (c - a)),
+            1.0 - (b - x)**2 / ((b - a) * (b - c))
+            )
+        return {"lower": a, "mode": c, "upper": b}, float(ll[i]), cdf
+
+    # The fitting functions, the Make* functions and whether or not strictly
+    # positive samples are required, by family name.
+    _fitters = {
+        "exponential": (
+            lambda x, n: details._fit_exponential(x, n),
+            lambda p: MakeExponential(**p), True
+            ),
+        "normal": (
+            lambda x, n: details._fit_normal(x, n),
+            lambda p: MakeNormal(**p), False
+            ),
+        "lognormal": (
+            lambda x, n: details._fit_lognormal(x, n),
+            lambda p: MakeLogNormal(**p), True
+            ),
+        "gamma": (
+            lambda x, n: details._fit_gamma(x, n),
+            lambda p: MakeGamma(**p), True
+            ),
+        "uniform": (
+            lambda x, n: details._fit_uniform(x, n),
+            lambda p: MakeUniform(**p), False
+            ),
+        "triangular": (
+            lambda x, n: details._fit_triangular(x, n),
+            lambda p: MakeTriangular(**p), False
+            )
+        }
+
+    @staticmethod
+    def _sample(dist, n: int, rng) -> np.ndarray:
+        if isinstance(dist, BufferedDistribution):
+            return dist.Draw(n, rng)
+
+        info = details._dist_params.get(dist)
+        if info is not None:
+            return details._samplers[info[0]](rng, n, *info[1])
+
+        # Not built here or of a family without a NumPy equivalent so draw
+        # from the distribution itself with a generator seeded from rng.
+        gen = System.Random(int(rng.integers(0, 2**31 - 1)))
+        return np.fromiter(
+            (dist.NextRandom(gen) for _ in range(n)), dtype=float, count=n
+            )
+
+
+def MakeExponential(mean: float, location: float=0.0, intern: bool=True) -> CD.Exponential:
     """ Creates, configures, and returns a new instance of an Exponential
     distribution using the supplied parameters.
         
@@ -13,15 +369,24 @@ def MakeExponential(mean: float, location: float=0.0) -> CD.Exponential:
         more common "lambda" parameter.
     location: float
         An optional parameter that shifts the distribution along the x-axis.
+    intern: bool
+        Whether or not to return the same instance as any earlier call with
+        the same parameters.  Sharing is safe as long as the distribution is
+        not modified after it is created.  Specify False to get a distinct
+        instance that can be modified.  Shared instances are forgotten when
+        inputs are loaded using pymdt.io.ReadInputFile or ImportInputFile.
         
     Returns
     -------
     Common.Distributions.Exponential:
         The newly created and configured Exponential distribution.
     """
-    return CD.Exponential(1.0/mean, location)
+    return details._make(
+        "exponential", lambda: CD.Exponential(1.0/mean, location),
+        intern, mean, location
+        )
 
-def MakeNormal(mean: float=0.0, std_dev: float=1.0) -> CD.Normal:
+def MakeNormal(mean: float=0.0, std_dev: float=1.0, intern: bool=True) -> CD.Normal:
     """ Creates, configures, and returns a new instance of a Normal distribution
     using the supplied parameters.
         
@@ -31,15 +396,19 @@ def MakeNormal(mean: float=0.0, std_dev: float=1.0) -> CD.Normal:
         The mean of the new Normal distribution.
     std_dev: float
         The standard deviation of the newly created Normal distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Normal:
         The newly created and configured Normal distribution.
     """
-    return CD.Normal(mean, std_dev)
+    return details._make(
+        "normal", lambda: CD.Normal(mean, std_dev), intern, mean, std_dev
+        )
 
-def MakeUniform(lower: float=0.0, upper: float=1.0) -> CD.Uniform:
+def MakeUniform(lower: float=0.0, upper: float=1.0, intern: bool=True) -> CD.Uniform:
     """ Creates, configures, and returns a new instance of a Uniform
     distribution using the supplied parameters.
         
@@ -49,15 +418,19 @@ def MakeUniform(lower: float=0.0, upper: float=1.0) -> CD.Uniform:
         The lower value of the new Uniform distribution.
     upper: float
         The upper value of the new Uniform distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Uniform:
         The newly created and configured Uniform distribution.
     """
-    return CD.Uniform(lower, upper)
+    return details._make(
+        "uniform", lambda: CD.Uniform(lower, upper), intern, lower, upper
+        )
 
-def MakeFixed(value: float=0.0) -> CD.Fixed:
+def MakeFixed(value: float=0.0, intern: bool=True) -> CD.Fixed:
     """ Creates, configures, and returns a new instance of a Fixed
     distribution using the supplied parameters.
         
@@ -65,15 +438,17 @@ def MakeFixed(value: float=0.0) -> CD.Fixed:
     ----------
     value: float
         The fixed value of the new Fixed distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Fixed:
         The newly created and configured Fixed distribution.
     """
-    return CD.Fixed(value)
+    return details._make("fixed", lambda: CD.Fixed(value), intern, value)
 
-def MakeLogNormal(location: float=0.0, scale: float=1.0) -> CD.LogNormal:
+def MakeLogNormal(location: float=0.0, scale: float=1.0, intern: bool=True) -> CD.LogNormal:
     """ Creates, configures, and returns a new instance of a LogNormal
     distribution using the supplied parameters.
         
@@ -85,15 +460,20 @@ def MakeLogNormal(location: float=0.0, scale: float=1.0) -> CD.LogNormal:
     scale: float
         The scale value of the new LogNormal distribution.  This is equivalent
         to the standard deviation of the logarithm of the random variable.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.LogNormal:
         The newly created and configured LogNormal distribution.
     """
-    return CD.LogNormal(location, scale)
+    return details._make(
+        "lognormal", lambda: CD.LogNormal(location, scale),
+        intern, location, scale
+        )
 
-def MakeCauchy(location: float=0.0, scale: float=1.0) -> CD.Cauchy:
+def MakeCauchy(location: float=0.0, scale: float=1.0, intern: bool=True) -> CD.Cauchy:
     """ Creates, configures, and returns a new instance of a Cauchy
     distribution using the supplied parameters.
         
@@ -103,15 +483,20 @@ def MakeCauchy(location: float=0.0, scale: float=1.0) -> CD.Cauchy:
         The location value of the new Cauchy distribution.
     scale: float
         The scale value of the new Cauchy distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Cauchy:
         The newly created and configured Cauchy distribution.
     """
-    return CD.Cauchy(location, scale)
+    return details._make(
+        "cauchy", lambda: CD.Cauchy(location, scale), intern, location,
+        scale
+        )
 
-def MakeBinomial(trials: float=1.0, success_fraction: float=0.5) -> CD.Binomial:
+def MakeBinomial(trials: float=1.0, success_fraction: float=0.5, intern: bool=True) -> CD.Binomial:
     """ Creates, configures, and returns a new instance of a Binomial
     distribution using the supplied parameters.
         
@@ -121,15 +506,20 @@ def MakeBinomial(trials: float=1.0, success_fraction: float=0.5) -> CD.Binomial:
         The trials value of the new Binomial distribution.
     success_fraction: float
         The success fraction value of the new Binomial distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Binomial:
         The newly created and configured Binomial distribution.
     """
-    return CD.Binomial(trials, success_fraction)
+    return details._make(
+        "binomial", lambda: CD.Binomial(trials, success_fraction),
+        intern, trials, success_fraction
+        )
 
-def MakeBernoulli(success_fraction: float=0.5) -> CD.Bernoulli:
+def MakeBernoulli(success_fraction: float=0.5, intern: bool=True) -> CD.Bernoulli:
     """ Creates, configures, and returns a new instance of a Bernoulli
     distribution using the supplied parameters.
         
@@ -137,15 +527,20 @@ def MakeBernoulli(success_fraction: float=0.5) -> CD.Bernoulli:
     ----------
     success_fraction: float
         The success fraction value of the new Bernoulli distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Bernoulli:
         The newly created and configured Bernoulli distribution.
     """
-    return CD.Bernoulli(success_fraction)
+    return details._make(
+        "bernoulli", lambda: CD.Bernoulli(success_fraction),
+        intern, success_fraction
+        )
 
-def MakeGamma(shape: float, scale: float=1.0) -> CD.Gamma:
+def MakeGamma(shape: float, scale: float=1.0, intern: bool=True) -> CD.Gamma:
     """ Creates, configures, and returns a new instance of a Gamma
     distribution using the supplied parameters.
         
@@ -155,15 +550,19 @@ def MakeGamma(shape: float, scale: float=1.0) -> CD.Gamma:
         The shape value of the new Gamma distribution.
     scale: float
         The scale value of the new Gamma distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Gamma:
         The newly created and configured Gamma distribution.
     """
-    return CD.Gamma(shape, scale)
+    return details._make(
+        "gamma", lambda: CD.Gamma(shape, scale), intern, shape, scale
+        )
 
-def MakePoisson(mean: float=1.0) -> CD.Poisson:
+def MakePoisson(mean: float=1.0, intern: bool=True) -> CD.Poisson:
     """ Creates, configures, and returns a new instance of a Poisson
     distribution using the supplied parameters.
         
@@ -171,15 +570,17 @@ def MakePoisson(mean: float=1.0) -> CD.Poisson:
     ----------
     mean: float
         The mean value of the new Poisson distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Poisson:
         The newly created and configured Poisson distribution.
     """
-    return CD.Poisson(mean)
+    return details._make("poisson", lambda: CD.Poisson(mean), intern, mean)
 
-def MakeTriangular(lower: float=-1.0, mode: float=0.0, upper: float=1.0) -> CD.Triangular:
+def MakeTriangular(lower: float=-1.0, mode: float=0.0, upper: float=1.0, intern: bool=True) -> CD.Triangular:
     """ Creates, configures, and returns a new instance of a Triangular
     distribution using the supplied parameters.
         
@@ -191,39 +592,77 @@ def MakeTriangular(lower: float=-1.0, mode: float=0.0, upper: float=1.0) -> CD.T
         The mode of the new Triangular distribution.
     upper: float
         The upper value of the new Triangular distribution.
+    intern: bool
+        Whether or not to share instances as described for MakeExponential.
         
     Returns
     -------
     Common.Distributions.Triangular:
         The newly created and configured Triangular distribution.
     """
-    return CD.Triangular(lower, mode, upper)
+    return details._make(
+        "triangular", lambda: CD.Triangular(lower, mode, upper),
+        intern, lower, mode, upper
+        )
 
-def MakeDiscrete(entries) -> MDT.Discrete:
+def MakeDiscrete(entries, weights=None) -> MDT.Discrete:
     """ Creates, configures, and returns a new instance of a Discrete
     distribution using the supplied parameters.
+
+    The probabilities are scaled to sum to 1, entries with the same value are
+    combined and entries with no probability are dropped.  Discrete
+    distributions are never shared (see MakeExponential) because their
+    entries can be modified.
         
     Parameters
     ----------
     entries
-        Can be a 2-tuple of a singular entry (value, probability) or a
-        dictionary of multiple entries of the form {value1: probability1, ...}.
+        Can be a 2-tuple of a singular entry (value, probability), a
+        dictionary of multiple entries of the form {value1: probability1, ...},
+        an iterable of (value, probability) pairs or, if weights is supplied,
+        an array of the values.
+    weights
+        An array of the relative probabilities of the values in entries.  This
+        is the efficient way to build a distribution with many entries.
         
     Returns
     -------
     MDT.Discrete:
         The newly created and configured Discrete distribution.
     """
+    if weights is not None:
+        vals = np.asarray(entries, dtype=float).ravel()
+        weights = np.asarray(weights, dtype=float).ravel()
+        if vals.size != weights.size:
+            raise ValueError(
+                "There must be one weight per value.  There are " +
+                str(vals.size) + " values and " + str(weights.size) +
+                " weights."
+                )
+    else:
+        if type(entries) is tuple and len(entries) == 2 and \
+            np.isscalar(entries[0]):
+            entries = [entries]
+        elif isinstance(entries, dict):
+            entries = entries.items()
+        pairs = np.asarray(list(entries), dtype=float).reshape(-1, 2)
+        vals, weights = pairs[:, 0], pairs[:, 1]
+
+    probs = details._weights_to_probabilities(weights, "probabilities")
+    vals, inv = np.unique(vals, return_inverse=True)
+    probs = np.bincount(inv.ravel(), weights=probs, minlength=vals.size)
+    keep = probs > 0.0
+    vals, probs = vals[keep], probs[keep]
+
     d = MDT.Discrete()
     ents = d.get_Entries()
     undos = Common.Undoing.NullUndoPack()
-    if type(entries) is tuple:
-        entries = {entries(0): entries(1)}
-    elif type(entries) is not dict:
-        entries = {entries}
-    for ent in entries.items():
-        ents.Add(MDT.DiscreteEntry(ent[0], ent[1]), undos)
-    return d
+    for val, prob in zip(vals.tolist(), probs.tolist()):
+        ents.Add(MDT.DiscreteEntry(val, prob), undos)
+
+    return details._register(
+        d, "discrete", vals, *details._build_alias_table(probs)
+        )
          
 def MakePlacement(init_dist: CD.IDistribution, subseq_dist: CD.IDistribution) -> MDT.PlacementDistribution:
     """ Creates, configures, and returns a new instance of a Placement
@@ -241,7 +680,10 @@ def MakePlacement(init_dist: CD.IDistribution, subseq_dist: CD.IDistribution) ->
     MDT.PlacementDistribution:
         The newly created and configured Placement distribution.
     """
-    return MDT.PlacementDistribution(init_dist, subseq_dist)
+    return details._register(
+        MDT.PlacementDistribution(init_dist, subseq_dist), "placement",
+        init_dist, subseq_dist
+        )
 
 def MakeTimeOfYearBiased(basis_dist: CD.IDistribution, time_of_year_dist: CD.IDistribution) -> MDT.TimeOfYearBiasDistribution:
     """ Creates, configures, and returns a new instance of a Time-of-Year Biased
@@ -261,3 +703,408 @@ def MakeTimeOfYearBiased(basis_dist: CD.IDistribution, time_of_year_dist: CD.IDi
         The newly created and configured Time-of-Year Biased distribution.
     """
     return MDT.TimeOfYearBiasDistribution(basis_dist, time_of_year_dist)
+
+def Sample(dist: CD.IDistribution, n: int, seed=None) -> np.ndarray:
+    """ Draws a number of values from a distribution into a NumPy array.
+
+    Distributions created by the Make* functions of this module since inputs
+    were last loaded are sampled using vectorized NumPy equivalents of their
+    families, including when they are read back from the model.  The values are
+    statistically equivalent to, but not the same as, the values the MDT
+    would draw.  Any other distribution (including custom and Time-of-Year
+    Biased distributions) is sampled by calling its NextRandom method with a
+    System.Random generator seeded from seed.  The buffered custom
+    distributions of this module are sampled directly with NumPy.
+
+    Parameters
+    ----------
+    dist: CD.IDistribution
+        The distribution from which to draw.
+    n: int
+        The number of values to draw.
+    seed
+        The seed of the generator used to draw the values.  Anything accepted
+        by numpy.random.default_rng can be used.  If None, the draws are not
+        repeatable.
+
+    Returns
+    -------
+    np.ndarray:
+        An array of the n values drawn.
+    """
+    return np.asarray(
+        details._sample(dist, int(n), np.random.default_rng(seed)),
+        dtype=float
+        )
+
+def Fit(samples, families=None) -> list:
+    """ Fits distributions to a set of observations by maximum likelihood and
+    ranks them from best to worst.
+
+    The supported families are exponential (with no location shift), normal,
+    lognormal, gamma, uniform and triangular.  Families that require
+    strictly positive values are skipped if any sample is not.  Fits are
+    ranked by the Akaike information criterion and the Kolmogorov-Smirnov
+    statistic of each is reported as well.
+
+    .. code-block:: python
+
+        best = pymdt.distributions.Fit(repair_hours)[0]
+        print(best)
+        pymdt.core.MakeFailureMode(gen, "Repair", mttr=best.distribution)
+
+    Parameters
+    ----------
+    samples
+        The observations.  Non-finite values are ignored.
+    families
+        The names of the families to fit.  If None, all supported families
+        are fit.
+
+    Returns
+    -------
+    list:
+        A list of fit_result objects ordered from best to worst fit.
+    """
+    if families is None: families = details._fitters.keys()
+    for fam in families:
+        if fam not in details._fitters:
+            raise KeyError(
+                "Unknown distribution family \"" + str(fam) + "\".  The " +
+                "supported families are " + ", ".join(details._fitters) + "."
+                )
+
+    x = np.asarray(samples, dtype=float).ravel()
+    x = np.sort(x[np.isfinite(x)])
+    n = x.size
+    if n < 2 or x[0] == x[-1]:
+        raise ValueError(
+            "At least 2 distinct finite samples are needed to fit " +
+            "distributions."
+            )
+
+    ecdf_hi = np.arange(1, n + 1) / n
+    ecdf_lo = np.arange(0, n) / n
+
+    ret = []
+    for fam in families:
+        fitter, maker, positive = details._fitters[fam]
+        if positive and x[0] <= 0.0: continue
+        params, ll, cdf = fitter(x, n)
+        params = {k: float(v) for k, v in params.items()}
+        ks = float(max(np.max(ecdf_hi - cdf), np.max(cdf - ecdf_lo)))
+        ret.append(fit_result(
+            fam, params, float(ll), 2.0 * len(params) - 2.0 * ll, ks,
+            maker(params)
+            ))
+
+    ret.sort(key=lambda r: r.aic)
+    return ret
+
+class BufferedDistribution(MDT.CustomDistributionBase):
+    """ A base class for custom distributions that draw their values with
+    NumPy.
+
+    The MDT calls NextRandom once per value needed which, for a Python custom
+    distribution, is a comparatively expensive call.  Objects of this class
+    draw a large block of values at a time using the Draw method of the
+    derived class and serve NextRandom from that block.
+
+    The values are drawn from a NumPy generator owned by the distribution
+    rather than the generator passed to NextRandom.  Clones get generators
+    spawned from the one of the original so that they produce independent but
+    repeatable streams.
+
+    Derived classes implement Draw, Bounds and Describe and pass their
+    constructor arguments to this class so that they can be cloned.
+    """
+
+    __namespace__ = "PyMDTDistributionSpace"
+
+    DefaultBufferSize = 65536
+    """ The number of values drawn at a time if not otherwise specified.
+    """
+
+    def __init__(self, *args, seed=None, buffer_size: int=None):
+        super().__init__()
+        self._args = args
+        self._seeds = seed if isinstance(seed, np.random.SeedSequence) \
+            else np.random.SeedSequence(seed)
+        self._rng = np.random.default_rng(self._seeds)
+        self.BufferSize = buffer_size if buffer_size is not None \
+            else self.DefaultBufferSize
+        self._buffer = []
+        self._index = 0
+
+    def Draw(self, n: int, rng) -> np.ndarray:
+        """ Draws n values from this distribution.
+
+        Parameters
+        ----------
+        n: int
+            The number of values to draw.
+        rng: numpy.random.Generator
+            The generator to draw with.
+
+        Returns
+        -------
+        np.ndarray:
+            The n values drawn.
+        """
+        raise NotImplementedError(type(self).__name__ + " must implement Draw.")
+
+    def Bounds(self) -> tuple:
+        """ Returns the (lowest, highest) values this distribution can produce.
+        """
+        raise NotImplementedError(
+            type(self).__name__ + " must implement Bounds."
+            )
+
+    def Describe(self) -> str:
+        """ Returns a short description of this distribution.
+        """
+        return type(self).__name__
+
+    def NextRandom(self, gen):
+        if self._index >= len(self._buffer):
+            self._buffer = self.Draw(self.BufferSize, self._rng).tolist()
+            self._index = 0
+        ret = self._buffer[self._index]
+        self._index += 1
+        return ret
+
+    def Support(self):
+        lo, hi = self.Bounds()
+        return Common.Util.Pair[float, float](float(lo), float(hi))
+
+    def Clone(self) -> CD.IDistribution:
+        return type(self)(
+            *self._args, seed=self._seeds.spawn(1)[0],
+            buffer_size=self.BufferSize
+            )
+
+    def ToString(self):
+        return self.Describe()
+
+class EmpiricalDistribution(BufferedDistribution):
+    """ A custom distribution that produces one of a set of values with
+    probability proportional to a weight for each.
+
+    Draws use an alias table so that their cost does not depend on the number
+    of values.
+    """
+
+    __namespace__ = "PyMDTDistributionSpace"
+
+    def __init__(self, values, weights=None, seed=None, buffer_size: int=None):
+        """ Initializes this distribution.
+
+        Parameters
+        ----------
+        values
+            The values that can be produced.
+        weights
+            The relative likelihood of each value.  If None, all values are
+            equally likely which makes this an empirical distribution of
+            observed values.
+        seed
+            The seed of the generator used to draw values.
+        buffer_size: int
+            The number of values to draw at a time.
+        """
+        super().__init__(values, weights, seed=seed, buffer_size=buffer_size)
+        self.Values = np.asarray(values, dtype=float).ravel()
+        self.Probabilities = details._weights_to_probabilities(
+            np.ones(self.Values.size) if weights is None else weights,
+            "weights"
+            )
+        if self.Probabilities.size != self.Values.size:
+            raise ValueError(
+                "There must be one weight per value.  There are " +
+                str(self.Values.size) + " values and " +
+                str(self.Probabilities.size) + " weights."
+                )
+        self._prob, self._alias = details._build_alias_table(self.Probabilities)
+
+    def Draw(self, n: int, rng) -> np.ndarray:
+        return self.Values[details._sample_alias(rng, n, self._prob, self._alias)]
+
+    def Bounds(self) -> tuple:
+        return self.Values.min(), self.Values.max()
+
+    def Describe(self) -> str:
+        return "Empirical (" + str(self.Values.size) + " values)"
+
+class HistogramDistribution(BufferedDistribution):
+    """ A custom distribution that chooses a bin of a histogram with
+    probability proportional to its count and then a value uniformly within
+    the bin.
+    """
+
+    __namespace__ = "PyMDTDistributionSpace"
+
+    def __init__(self, edges, counts, seed=None, buffer_size: int=None):
+        """ Initializes this distribution.
+
+        Parameters
+        ----------
+        edges
+            The increasing bin edges.  There must be one more edge than
+            counts.
+        counts
+            The number of observations in each bin.
+        seed
+            The seed of the generator used to draw values.
+        buffer_size: int
+            The number of values to draw at a time.
+        """
+        super().__init__(edges, counts, seed=seed, buffer_size=buffer_size)
+        self.Edges = np.asarray(edges, dtype=float).ravel()
+        probs = details._weights_to_probabilities(counts, "counts")
+        if self.Edges.size != probs.size + 1:
+            raise ValueError(
+                "There must be one more edge than counts.  There are " +
+                str(self.Edges.size) + " edges and " + str(probs.size) +
+                " counts."
+                )
+        if np.any(np.diff(self.Edges) <= 0.0):
+            raise ValueError("The histogram edges must be increasing.")
+        self._prob, self._alias = details._build_alias_table(probs)
+
+    def Draw(self, n: int, rng) -> np.ndarray:
+        idx = details._sample_alias(rng, n, self._prob, self._alias)
+        lo = self.Edges[idx]
+        return lo + rng.random(n) * (self.Edges[idx + 1] - lo)
+
+    def Bounds(self) -> tuple:
+        return self.Edges[0], self.Edges[-1]
+
+    def Describe(self) -> str:
+        return "Histogram (" + str(self.Edges.size - 1) + " bins)"
+
+class BootstrapDistribution(BufferedDistribution):
+    """ A custom distribution that resamples a set of observations, optionally
+    smoothed by adding normally distributed noise.
+    """
+
+    __namespace__ = "PyMDTDistributionSpace"
+
+    def __init__(self, data, smoothing: float=0.0, seed=None, buffer_size: int=None):
+        """ Initializes this distribution.
+
+        Parameters
+        ----------
+        data
+            The observations to resample.
+        smoothing: float
+            The standard deviation of the noise added to each value as a
+            fraction of the standard deviation of the data.  Values are never
+            made lower than the lowest observation or higher than the highest.
+        seed
+            The seed of the generator used to draw values.
+        buffer_size: int
+            The number of values to draw at a time.
+        """
+        super().__init__(data, smoothing, seed=seed, buffer_size=buffer_size)
+        self.Data = np.asarray(data, dtype=float).ravel()
+        if self.Data.size == 0:
+            raise ValueError("No data was supplied to bootstrap from.")
+        self.Smoothing = smoothing
+        self._noise = smoothing * self.Data.std()
+
+    def Draw(self, n: int, rng) -> np.ndarray:
+        ret = self.Data[rng.integers(0, self.Data.size, n)]
+        if self._noise > 0.0:
+            ret = np.clip(
+                ret + rng.normal(0.0, self._noise, n), *self.Bounds()
+                )
+        return ret
+
+    def Bounds(self) -> tuple:
+        return self.Data.min(), self.Data.max()
+
+    def Describe(self) -> str:
+        return "Bootstrap (" + str(self.Data.size) + " observations)"
+
+class PiecewiseLinearCDFDistribution(BufferedDistribution):
+    """ A custom distribution whose cumulative distribution function is linear
+    between a set of points.
+
+    Values are drawn by inverting the function.
+    """
+
+    __namespace__ = "PyMDTDistributionSpace"
+
+    def __init__(self, x, cdf, seed=None, buffer_size: int=None):
+        """ Initializes this distribution.
+
+        Parameters
+        ----------
+        x
+            The increasing values at which the function is known.
+        cdf
+            The non-decreasing cumulative probabilities at each x.  These are
+            scaled to go from 0 at the first point to 1 at the last.
+        seed
+            The seed of the generator used to draw values.
+        buffer_size: int
+            The number of values to draw at a time.
+        """
+        super().__init__(x, cdf, seed=seed, buffer_size=buffer_size)
+        self.X = np.asarray(x, dtype=float).ravel()
+        c = np.asarray(cdf, dtype=float).ravel()
+        if self.X.size < 2 or c.size != self.X.size:
+            raise ValueError(
+                "At least 2 points with one probability per point are needed."
+                )
+        if np.any(np.diff(self.X) <= 0.0) or np.any(np.diff(c) < 0.0):
+            raise ValueError(
+                "The x values must be increasing and the cumulative " +
+                "probabilities must be non-decreasing."
+                )
+        if c[-1] <= c[0]:
+            raise ValueError("The cumulative probabilities must not be flat.")
+        self.CDF = (c - c[0]) / (c[-1] - c[0])
+
+    def Draw(self, n: int, rng) -> np.ndarray:
+        return np.interp(rng.random(n), self.CDF, self.X)
+
+    def Bounds(self) -> tuple:
+        return self.X[0], self.X[-1]
+
+    def Describe(self) -> str:
+        return "Piecewise Linear CDF (" + str(self.X.size) + " points)"
+
+def DistributionInterningReport() -> dict:
+    """ Reports on the sharing of distributions by the Make* functions.
+
+    Returns
+    -------
+    dict:
+        A dictionary keyed by family name.  Each value is a dictionary with
+        the keys instances (the number of distinct shared distributions),
+        requests (the number of Make* calls that allowed sharing) and reuses
+        (the number of those calls served by an existing instance which is
+        the number of .NET objects that were not created).
+    """
+    ret = {
+        fam: {"instances": 0, "requests": req, "reuses": 0}
+        for fam, req in details._intern_requests.items()
+        }
+    for fam, _ in details._interned:
+        ret[fam]["instances"] += 1
+    for fam, reuses in details._intern_reuses.items():
+        ret[fam]["reuses"] = reuses
+    return ret
+
+def ClearDistributionInterning():
+    """ Forgets all shared distributions and resets the report.
+
+    Distributions already in use are unaffected but later Make* calls create
+    new instances.  The shared distributions, but not the report, are also
+    forgotten whenever inputs are loaded using pymdt.io.ReadInputFile or
+    ImportInputFile.
+    """
+    details._interned.clear()
+    details._intern_requests.clear()
+    details._intern_reuses.clear()
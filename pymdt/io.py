@@ -3,6 +3,7 @@ import os
 import MDT
 import pymdt
 import pymdt.utils
+import pymdt.distributions
 
 import System
 import Common.Logging
@@ -115,6 +116,7 @@ def ImportInputFile(file_name, format=None, errLog: Common.Logging.Log=None) ->
     fileFmt = format or IUF.FindFileFormat(SUF.INPUT_TYPE_TAG, ext)
     serializer = IUF.GetImporter(SUF.INPUT_TYPE_TAG, fileFmt)
     slog = Common.Logging.Log()
+    pymdt.distributions.details._release_distributions()
     
     hdnlr = getattr(serializer, "OnNeedUserInput")        
     hdnlr += details._onNeedUserInput
@@ -167,6 +169,7 @@ def ReadInputFile(file_name, errLog: Common.Logging.Log=None, **kwargs) -> Commo
     serializer.MakeBackups = kwargs.get("make_backup", False)
     binder = MDT.PRM.CustomSerializationBinder()
     if errLog is None: errLog = Common.Logging.Log()
+    pymdt.distributions.details._release_distributions()
     
     try:
         return serializer.Load(
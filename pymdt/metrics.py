@@ -1,10 +1,19 @@
+import csv
+import time
+import functools
+import collections
+
+import numpy as np
+
 from enum import Enum
 
 import TMO
 import MDT
 import MDT.PRM
+import Common
 
 import pymdt.utils
+import pymdt.results
     
 class improvement_types(Enum):
     """ An enumeration of the improvement types used for metrics.
@@ -90,7 +99,333 @@ class sim_phases(Enum):
     """
 
 
+class evaluation_cache:
+    """ A bounded, least recently used cache of the responses computed by a
+    custom metric keyed by configuration signature.
+
+    An instance is created for each metric object by the memoize_evaluation
+    decorator and can be retrieved using GetEvaluationCache.  Instances are
+    not thread safe.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        """ The maximum number of responses held.
+        """
+
+        self.hits = 0
+        """ The number of evaluations answered from the cache.
+        """
+
+        self.misses = 0
+        """ The number of evaluations that had to be computed.
+        """
+
+        self.evictions = 0
+        """ The number of responses discarded to make room for newer ones.
+        """
+
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        ret = self._entries.get(key)
+        if ret is None:
+            self.misses += 1
+        else:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return ret
+
+    def put(self, key, response):
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """ Discards all cached responses and resets the statistics.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ The fraction of evaluations answered from the cache.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return (
+            str(self.hits) + " hits, " + str(self.misses) + " misses (" +
+            "{:.1%}".format(self.hit_rate) + "), " + str(len(self)) + "/" +
+            str(self.maxsize) + " entries, " + str(self.evictions) +
+            " evictions"
+            )
+
+class entity_handles:
+    """ A set of named model entities needed by a custom metric, resolved once
+    for each site in which the metric is evaluated.
+
+    Custom metrics are cloned along with the site each time the solver
+    creates a working copy and are evaluated against configurations whose
+    main site is one of those copies.  Finding the entity that corresponds to
+    an original one requires name based searches that are too slow to repeat
+    for every evaluation.  Declare the needed entities once, resolve them in
+    ResolveAllReferences and look them up by key during evaluation.
+
+    .. code-block:: python
+
+        class MyMetric(MDT.CustomMicrogridMetricBase):
+
+            __namespace__ = "MyMetricSpace"
+
+            def __init__(self, mg, name, units=""):
+                super().__init__(mg, name, units)
+                self.handles = pymdt.metrics.entity_handles()
+
+            def CustomEvaluate(self, config, installResp) -> TMO.Response:
+                bus = self.handles.get(config, "bus")
+                ...
+
+            def ResolveAllReferences(self):
+                self.handles.resolve(self.Site)
+
+            def Clone(self, forMG, copyUID) -> MDT.IMicrogridEntity:
+                ret = MyMetric(forMG, self.StringID, self.Units)
+                ret.CopyPropertiesFrom(self, copyUID)
+                ret.handles = self.handles.copy()
+                return ret
+
+        metric = MyMetric(mg, "Bus Availability", "%")
+        metric.handles.declare("bus", bus12)
+    """
+
+    def __init__(self, **kwargs):
+        self._declared = dict(kwargs)
+
+        # Only the entities of the most recently resolved site are kept since
+        # each clone of a metric is evaluated against a single working copy.
+        self._site = None
+        self._resolved = None
+
+    def declare(self, key: str, entity):
+        """ Adds an entity to be resolved under the supplied key.
+
+        Parameters
+        ----------
+        key: str
+            The key by which the entity is to be looked up.
+        entity
+            The entity (site, microgrid, bus, bus entity, etc.) as it exists
+            in the model being built.
+        """
+        self._declared[key] = entity
+        self._site = None
+        self._resolved = None
+
+    def resolve(self, site: MDT.Site) -> dict:
+        """ Finds the entities corresponding to all declared ones in the
+        supplied site and stores them for later lookup in place of those of
+        any previously resolved site.
+
+        This is meant to be called from ResolveAllReferences and is the only
+        place that searches by name.
+
+        Parameters
+        ----------
+        site: MDT.Site
+            The site in which to find the corresponding entities.
+
+        Returns
+        -------
+        dict:
+            The resolved entities by key.  An entity that cannot be found in
+            the site maps to None.
+        """
+        ret = {
+            key: pymdt.results.FindCorrespondingAsset(ent, site)
+            for key, ent in self._declared.items()
+            }
+        self._site = site
+        self._resolved = ret
+        return ret
+
+    def for_config(self, config: MDT.SiteUpgradeConfiguration) -> dict:
+        """ Returns the resolved entities for the main site of the supplied
+        configuration, resolving them first only if that site is not the one
+        most recently resolved.
+
+        Parameters
+        ----------
+        config: MDT.SiteUpgradeConfiguration
+            The configuration being evaluated.
+
+        Returns
+        -------
+        dict:
+            The resolved entities by key.
+        """
+        site = config.MainSite
+        if self._site is not None and self._site == site: return self._resolved
+        return self.resolve(site)
+
+    def get(self, config: MDT.SiteUpgradeConfiguration, key: str):
+        """ Returns the entity declared under key as it exists in the main site
+        of the supplied configuration.
+
+        Parameters
+        ----------
+        config: MDT.SiteUpgradeConfiguration
+            The configuration being evaluated.
+        key: str
+            The key under which the entity was declared.
+
+        Returns
+        -------
+        The corresponding entity or None if it could not be found.
+        """
+        return self.for_config(config)[key]
+
+    def copy(self):
+        """ Creates a new set of handles with the same declarations and
+        nothing resolved.  Use this when cloning a custom metric.
+        """
+        return entity_handles(**self._declared)
+
+    def __contains__(self, key):
+        return key in self._declared
+
+    def __len__(self):
+        return len(self._declared)
+
+class metric_timing:
+    """ The evaluation timing statistics recorded for a single custom metric.
+    """
+
+    def __init__(self, microgrid: str, metric: str):
+        self.microgrid = microgrid
+        """ The name of the microgrid of the metric.
+        """
+
+        self.metric = metric
+        """ The name of the metric.
+        """
+
+        self.evaluations = 0
+        """ The number of configurations for which a response was requested.
+        """
+
+        self.cache_hits = 0
+        """ The number of those evaluations answered from a cache.
+        """
+
+        self.total = 0.0
+        """ The total time spent in evaluation in seconds.
+        """
+
+        self.samples = collections.deque(maxlen=details.TIMING_SAMPLE_LIMIT)
+        """ The most recent per-evaluation latencies in seconds.
+        """
+
+    def percentile(self, q: float) -> float:
+        """ Returns the q'th percentile (0-100) of the recorded latencies in
+        seconds or nan if nothing has been recorded.
+        """
+        if len(self.samples) == 0: return float("nan")
+        return float(np.percentile(np.fromiter(self.samples, dtype=float), q))
+
+    def as_row(self) -> dict:
+        """ Returns these statistics as a row of the table produced by
+        MetricTimingTable with latencies in milliseconds.
+        """
+        n = self.evaluations
+        return {
+            "microgrid": self.microgrid,
+            "metric": self.metric,
+            "evaluations": n,
+            "cache_hits": self.cache_hits,
+            "hit_rate": self.cache_hits / n if n > 0 else float("nan"),
+            "total_s": self.total,
+            "mean_ms": 1000.0 * self.total / n if n > 0 else float("nan"),
+            "p50_ms": 1000.0 * self.percentile(50),
+            "p95_ms": 1000.0 * self.percentile(95),
+            "p99_ms": 1000.0 * self.percentile(99)
+            }
+
 class details:
+
+    # The attribute of a custom metric object that holds its evaluation_cache.
+    EVALUATION_CACHE_ATTR = "_pymdt_evaluation_cache"
+
+    # The number of latency samples kept per metric for percentiles.
+    TIMING_SAMPLE_LIMIT = 10000
+
+    # The metric name under which the time spent ensuring that the PRM
+    # evaluation of configurations is complete is recorded.
+    PRM_TIMING_NAME = "PRM evaluation"
+
+    _timing_enabled = True
+    _metric_timings = {}
+
+    _timing_table_columns = (
+        "group", "microgrid", "metric", "python", "evaluations", "cache_hits",
+        "hit_rate", "total_s", "mean_ms", "p50_ms", "p95_ms", "p99_ms"
+        )
+
+    @staticmethod
+    def _timing_key(metric) -> tuple:
+        mg = getattr(metric, "Microgrid", None)
+        return ("" if mg is None else mg.StringID, metric.StringID)
+
+    @staticmethod
+    def _prm_timing_key(metric) -> tuple:
+        return (details._timing_key(metric)[0], details.PRM_TIMING_NAME)
+
+    @staticmethod
+    def _record_metric_evaluation(metric, seconds: float, evaluations: int=1, hits: int=0):
+        if not details._timing_enabled or evaluations == 0: return
+        details._record_timing(
+            details._timing_key(metric), seconds, evaluations, hits
+            )
+
+    @staticmethod
+    def _ensure_prm_evaluated(metric, configs):
+        if len(configs) == 0: return
+        start = time.perf_counter()
+        prm = MDT.PRM.PRMEvaluator.INSTANCE
+        for config in configs: prm.EnsurePRMEvaluated(config)
+        if not details._timing_enabled: return
+        details._record_timing(
+            details._prm_timing_key(metric), time.perf_counter() - start,
+            len(configs)
+            )
+
+    @staticmethod
+    def _record_timing(key: tuple, seconds: float, evaluations: int, hits: int=0):
+        rec = details._metric_timings.get(key)
+        if rec is None:
+            rec = details._metric_timings[key] = metric_timing(*key)
+        rec.evaluations += evaluations
+        rec.cache_hits += hits
+        rec.total += seconds
+        rec.samples.append(seconds / evaluations)
+
+    @staticmethod
+    def _get_evaluation_cache(metric, maxsize: int) -> evaluation_cache:
+        cache = getattr(metric, details.EVALUATION_CACHE_ATTR, None)
+        if cache is None:
+            cache = evaluation_cache(maxsize)
+            setattr(metric, details.EVALUATION_CACHE_ATTR, cache)
+        return cache
+
+    @staticmethod
+    def _install_response(metric, config, response):
+        config.get_ModelUpgradeConfig(metric.Model).set_Response(metric, response)
     
     @staticmethod
     def _extract_load_tier(m: MDT.MicrogridLoadConstraint, **kwargs):
@@ -171,6 +506,113 @@ class details:
             )
         details._extract_value_beyond_objective(m, **kwargs)
 
+    # Maps the metric type names used by MakeMetrics to the Make*Metric
+    # function for that type.
+    _metric_makers = {
+        "maximum_load_drop_duration":
+            lambda *a, **kw: MakeMaximumLoadDropDurationMetric(*a, **kw),
+        "energy_availability":
+            lambda *a, **kw: MakeEnergyAvailabilityMetric(*a, **kw),
+        "average_energy_supplied_by_renewables":
+            lambda *a, **kw: MakeAverageEnergySuppliedByRenewablesMetric(*a, **kw),
+        "average_renewable_energy_spilled":
+            lambda *a, **kw: MakeAverageRenewableEnergySpilledMetric(*a, **kw),
+        "average_renewable_penetration":
+            lambda *a, **kw: MakeAverageRenewablePenetrationMetric(*a, **kw),
+        "average_spinning_reserve":
+            lambda *a, **kw: MakeAverageSpinningReserveMetric(*a, **kw),
+        "diesel_efficiency":
+            lambda *a, **kw: MakeDieselEfficiencyMetric(*a, **kw),
+        "diesel_fuel": lambda *a, **kw: MakeDieselFuelMetric(*a, **kw),
+        "diesel_fuel_cost": lambda *a, **kw: MakeDieselFuelCostMetric(*a, **kw),
+        "diesel_utilization_rate":
+            lambda *a, **kw: MakeDieselUtilizationRateMetric(*a, **kw),
+        "fossil_off_time_percentage":
+            lambda *a, **kw: MakeFossilOffTimePercentageMetric(*a, **kw),
+        "frequency_of_load_not_served":
+            lambda *a, **kw: MakeFrequencyOfLoadNotServedMetric(*a, **kw),
+        "magnitude_of_load_not_served":
+            lambda *a, **kw: MakeMagnitudeOfLoadNotServedMetric(*a, **kw),
+        "heat_recovery": lambda *a, **kw: MakeHeatRecoveryMetric(*a, **kw),
+        "maximum_mission_outage_duration":
+            lambda *a, **kw: MakeMaximumMissionOutageDurationMetric(*a, **kw),
+        "natural_gas_efficiency":
+            lambda *a, **kw: MakeNaturalGasEfficiencyMetric(*a, **kw),
+        "natural_gas_fuel":
+            lambda *a, **kw: MakeNaturalGasFuelMetric(*a, **kw),
+        "natural_gas_fuel_cost":
+            lambda *a, **kw: MakeNaturalGasFuelCostMetric(*a, **kw),
+        "natural_gas_utilization_rate":
+            lambda *a, **kw: MakeNaturalGasUtilizationRateMetric(*a, **kw),
+        "propane_efficiency":
+            lambda *a, **kw: MakePropaneEfficiencyMetric(*a, **kw),
+        "propane_fuel": lambda *a, **kw: MakePropaneFuelMetric(*a, **kw),
+        "propane_fuel_cost":
+            lambda *a, **kw: MakePropaneFuelCostMetric(*a, **kw),
+        "propane_utilization_rate":
+            lambda *a, **kw: MakePropaneUtilizationRateMetric(*a, **kw),
+        "total_fuel_cost": lambda *a, **kw: MakeTotalFuelCostMetric(*a, **kw)
+        }
+
+    # The enumerated arguments of the Make*Metric functions and their enums.
+    _metric_enum_args = {
+        "improvement_type": improvement_types,
+        "limit_stiffness": limit_stiffnesses,
+        "value_beyond_objective": value_beyond_objective,
+        "phase": sim_phases
+        }
+
+    _metric_float_args = ("limit", "objective", "relative_importance")
+
+    # Columns of a metric table that are not arguments of the Make function.
+    _metric_table_columns = ("type", "microgrid", "name", "group")
+
+    @staticmethod
+    def _metric_row_to_kwargs(row: dict, cache: dict) -> dict:
+        # String valued enum and tier arguments are converted once per unique
+        # value for the whole table using the cache.
+        ret = {}
+        for key, val in row.items():
+            if key is None or key in details._metric_table_columns: continue
+            if val is None or (type(val) is str and val.strip() == ""): continue
+            if key in details._metric_enum_args and type(val) is str:
+                ck = (key, val)
+                if ck not in cache:
+                    cache[ck] = details._metric_enum_args[key][val.strip()].value
+                val = cache[ck]
+            elif key == "tier" and type(val) is str:
+                ck = (key, val)
+                if ck not in cache:
+                    cache[ck] = pymdt.utils.FindEntityByName(
+                        MDT.Driver.INSTANCE.LoadTiers, val,
+                        find_fail_behavior=pymdt.utils.find_fail_behavior.throw,
+                        find_context="load tier master list"
+                        )
+                val = cache[ck]
+            elif key in details._metric_float_args:
+                val = float(val)
+            ret[key] = val
+        return ret
+
+    @staticmethod
+    def _metric_row_microgrid(row: dict, cache: dict, **kwargs) -> MDT.Microgrid:
+        mg = row.get("microgrid", kwargs.get("microgrid"))
+        if type(mg) is not str: return mg
+        ck = ("microgrid", mg)
+        if ck not in cache:
+            site = kwargs.get("site")
+            if site is None:
+                raise ValueError(
+                    "A site must be provided to find the microgrid named \"" +
+                    mg + "\"."
+                    )
+            cache[ck] = pymdt.utils.FindEntityByName(
+                site.Microgrids, mg,
+                find_fail_behavior=pymdt.utils.find_fail_behavior.throw,
+                find_context="site microgrid list"
+                )
+        return cache[ck]
+
     @staticmethod
     def _set_def_imp_type(defType, kwargs):
         if "improvement_type" not in kwargs: kwargs["improvement_type"] = defType
@@ -2259,3 +2701,493 @@ def MakeResponseFunctionGroup(s: TMO.SolverInterface, name: str, metrics, **kwar
             "get_ResponseFunctionGroups", rfg, **kwargs
             )
     return rfg
+
+def MakeMetrics(spec_table, **kwargs) -> dict:
+    """ Creates a whole suite of metrics, possibly for many microgrids, from the
+    rows of a table and optionally gathers them into response function groups.
+
+    Each row describes one metric and is passed to the Make*Metric function
+    for its type.  The columns are:
+
+    type
+        The type of metric.  This is the name of the Make function without the
+        leading "Make" and trailing "Metric" in lower case with underscores
+        such as energy_availability or diesel_fuel_cost.
+    microgrid
+        The MDT.Microgrid to which the metric belongs or the name of one in the
+        supplied site.  If not in the row, the microgrid argument is used.
+    name
+        The name of the new metric.
+    group
+        The optional name of a response function group into which to put the
+        metric.
+    anything else
+        Any argument of the Make function (limit, objective, improvement_type,
+        limit_stiffness, value_beyond_objective, phase, tier,
+        relative_importance, notes, etc.).  Enumerated arguments and tiers may
+        be given by name and each distinct name is looked up only once for the
+        whole table.  Empty cells are ignored.
+
+    Parameters
+    ----------
+    spec_table
+        Either the path of a CSV file with a header row or an iterable of
+        dictionaries mapping column names to values.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        site: MDT.Site
+            The site in which to find microgrids given by name.
+        microgrid: MDT.Microgrid
+            The microgrid to use for rows that do not name one.
+        solver: TMO.SolverInterface
+            The solver to which to add any response function groups that are
+            created.  If not provided, groups are created but not added to any
+            solver.
+        err_log: Common.Logging.Log
+            The log into which to record any errors encountered during the
+            building of the metrics and groups.  If this argument is not
+            provided, messages will be recorded into the pymdt.GlobalErrorLog
+            instance.  The same log is used for the whole table.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated during this operation (if any).  The same undo pack is
+            used for the whole table.
+
+    Returns
+    -------
+    dict:
+        A dictionary with the created metrics in table order under "metrics"
+        and the created response function groups keyed by name under "groups".
+    """
+    if type(spec_table) is str:
+        with open(spec_table, newline="") as fp:
+            spec_table = list(csv.DictReader(fp))
+
+    # Don't use kwargs.get to avoid creation of the UndoPack if not needed.
+    shared = {
+        "err_log": kwargs.get("err_log", pymdt.GlobalErrorLog),
+        "undos": kwargs["undos"] if "undos" in kwargs else \
+            Common.Undoing.UndoPack()
+        }
+
+    cache = {}
+    metrics = []
+    members = {}
+    for row in spec_table:
+        mtype = str(row["type"]).strip()
+        make = details._metric_makers.get(mtype)
+        if make is None:
+            raise KeyError("Unknown metric type " + mtype)
+        mg = details._metric_row_microgrid(row, cache, **kwargs)
+        args = details._metric_row_to_kwargs(row, cache)
+        args.update(shared)
+        m = make(mg, row["name"], **args)
+        metrics.append(m)
+        grp = row.get("group")
+        if grp: members.setdefault(grp, []).append(m)
+
+    groups = {
+        name: MakeResponseFunctionGroup(kwargs.get("solver"), name, ms, **shared)
+        for name, ms in members.items()
+        }
+    return {"metrics": metrics, "groups": groups}
+
+def memoize_evaluation(maxsize: int=1024):
+    """ A decorator for the CustomEvaluate method of a custom metric (a class
+    derived from MDT.CustomMicrogridMetricBase) that caches the responses it
+    computes.
+
+    The optimizer frequently revisits configurations it has already seen.
+    With this decorator, the response for a configuration whose variable
+    selections match one already evaluated (see
+    pymdt.results.GetConfigurationSignature) is returned, and installed if
+    requested, without calling the decorated method.  Each metric object has
+    its own cache so clones do not share results.  Evaluations are also timed
+    (see MetricTimingTable) so there is no need to add timed_evaluation.
+    Before a configuration that is not in the cache is passed to the decorated
+    method, its PRM evaluation is completed outside of the timed region and
+    the time that takes is recorded under the metric name "PRM evaluation" of
+    the same microgrid.  The call to EnsurePRMEvaluated made by the decorated
+    method then returns immediately.
+
+    Being a decorator, this can be added to the CustomEvaluate method of any
+    existing metric class without changing its base class.  BatchCustomMetric
+    uses the same per object cache for metrics that are written as a
+    vectorized formula instead.
+
+    The cached TMO.Response objects are not copied.  The same instance is
+    returned and installed for every configuration with the same signature so
+    neither the metric nor anything that reads the installed responses may
+    modify them.  The caches are not synchronized and are meant to be used by
+    the single thread in which the solver evaluates custom metrics.
+
+    .. code-block:: python
+
+        class MyMetric(MDT.CustomMicrogridMetricBase):
+
+            __namespace__ = "MyMetricSpace"
+
+            @pymdt.metrics.memoize_evaluation(maxsize=4096)
+            def CustomEvaluate(self, config, installResp) -> TMO.Response:
+                ...
+
+    Parameters
+    ----------
+    maxsize: int
+        The maximum number of responses to keep for each metric object.  The
+        least recently used are discarded first.
+
+    Returns
+    -------
+    A decorator to apply to a CustomEvaluate method.
+    """
+    def decorator(evaluate):
+        @functools.wraps(evaluate)
+        def wrapper(self, config, installResp):
+            start = time.perf_counter()
+            cache = details._get_evaluation_cache(self, maxsize)
+            key = pymdt.results.GetConfigurationSignature(config)
+            ret = cache.get(key)
+            if ret is not None:
+                if installResp: details._install_response(self, config, ret)
+                details._record_metric_evaluation(
+                    self, time.perf_counter() - start, hits=1
+                    )
+                return ret
+            lookup = time.perf_counter() - start
+            details._ensure_prm_evaluated(self, (config,))
+            start = time.perf_counter()
+            ret = evaluate(self, config, installResp)
+            if ret is not None: cache.put(key, ret)
+            details._record_metric_evaluation(
+                self, lookup + time.perf_counter() - start
+                )
+            return ret
+        return wrapper
+    return decorator
+
+def GetEvaluationCache(metric) -> evaluation_cache:
+    """ Returns the cache used by a custom metric whose CustomEvaluate method is
+    decorated with memoize_evaluation.
+
+    Use the returned object to report the hit rate or to clear the cache when
+    something other than the variable selections (such as the input data)
+    changes.
+
+    Parameters
+    ----------
+    metric
+        The custom metric object.
+
+    Returns
+    -------
+    evaluation_cache:
+        The cache of the metric or None if it has not yet evaluated anything.
+    """
+    return getattr(metric, details.EVALUATION_CACHE_ATTR, None)
+
+def timed_evaluation(evaluate):
+    """ A decorator for the CustomEvaluate method of a custom metric that
+    records the number and duration of its evaluations for MetricTimingTable.
+
+    Methods decorated with memoize_evaluation and the evaluations of
+    BatchCustomMetric objects are already timed.
+
+    .. code-block:: python
+
+        class MyMetric(MDT.CustomMicrogridMetricBase):
+
+            __namespace__ = "MyMetricSpace"
+
+            @pymdt.metrics.timed_evaluation
+            def CustomEvaluate(self, config, installResp) -> TMO.Response:
+                ...
+    """
+    @functools.wraps(evaluate)
+    def wrapper(self, config, installResp):
+        start = time.perf_counter()
+        ret = evaluate(self, config, installResp)
+        details._record_metric_evaluation(self, time.perf_counter() - start)
+        return ret
+    return wrapper
+
+def EnableMetricTiming(enabled: bool=True):
+    """ Turns the recording of custom metric evaluation times on or off.
+
+    Recording is on by default.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether or not evaluations should be recorded.
+    """
+    details._timing_enabled = enabled
+
+def ResetMetricTimings():
+    """ Discards all recorded custom metric evaluation times.
+
+    This is done automatically at the start of each run of
+    pymdt.solving.RunIslandedSolver.
+    """
+    details._metric_timings.clear()
+
+def GetMetricTiming(metric) -> metric_timing:
+    """ Returns the timing statistics recorded for a custom metric.
+
+    Statistics are kept by microgrid and metric name so this finds the ones
+    recorded by any clone of the supplied metric.
+
+    Parameters
+    ----------
+    metric
+        The metric whose statistics are sought.
+
+    Returns
+    -------
+    metric_timing:
+        The recorded statistics or None if nothing was recorded.
+    """
+    return details._metric_timings.get(details._timing_key(metric))
+
+def MetricTimingTable(solver: TMO.SolverInterface=None) -> list:
+    """ Builds a table of the evaluation statistics of every metric in every
+    response function group of a solver.
+
+    Only Python custom metrics can be timed.  The built in metrics are
+    evaluated entirely within the MDT and are listed with no evaluations so
+    that the table is complete; the time they and the reliability simulation
+    take is the remainder of the solver run time reported by
+    pymdt.solving.GetLastRunTimings.  Timed metrics that are not in any group
+    of the solver are listed last with an empty group, as is the time spent
+    completing the PRM evaluation of configurations before the evaluations of
+    memoized and batch metrics (under the metric name "PRM evaluation").
+
+    Parameters
+    ----------
+    solver: TMO.SolverInterface
+        The solver whose groups are to be listed.  If None, the solver of the
+        MDT driver is used.
+
+    Returns
+    -------
+    list:
+        A list of dictionaries, one per metric, with the keys group,
+        microgrid, metric, python, evaluations, cache_hits, hit_rate, total_s,
+        mean_ms, p50_ms, p95_ms and p99_ms.
+    """
+    if solver is None: solver = MDT.Driver.INSTANCE.Solver
+
+    ret = []
+    seen = set()
+    for rfg in solver.get_ResponseFunctionGroups():
+        for rf in rfg.get_ResponseFunctions():
+            key = details._timing_key(rf)
+            seen.add(key)
+            rec = details._metric_timings.get(key)
+            row = (rec if rec is not None else metric_timing(*key)).as_row()
+            row["group"] = rfg.StringID
+            row["python"] = isinstance(rf, MDT.CustomMicrogridMetricBase)
+            ret.append({c: row[c] for c in details._timing_table_columns})
+
+    for key, rec in details._metric_timings.items():
+        if key in seen: continue
+        row = rec.as_row()
+        row["group"] = ""
+        row["python"] = key[1] != details.PRM_TIMING_NAME
+        ret.append({c: row[c] for c in details._timing_table_columns})
+
+    return ret
+
+def WriteMetricTimingTable(file_name: str, solver: TMO.SolverInterface=None) -> int:
+    """ Writes the table produced by MetricTimingTable to a CSV file.
+
+    Parameters
+    ----------
+    file_name: str
+        The path of the file to write.
+    solver: TMO.SolverInterface
+        The solver whose groups are to be listed.  If None, the solver of the
+        MDT driver is used.
+
+    Returns
+    -------
+    int:
+        The number of metric rows written.
+    """
+    rows = MetricTimingTable(solver)
+    with open(file_name, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=details._timing_table_columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+class BatchCustomMetric(MDT.CustomMicrogridMetricBase):
+    """ A base class for custom metrics whose response is a formula that can be
+    applied to many configurations at once.
+
+    Rather than overriding CustomEvaluate, derived classes implement two hooks.
+    ExtractStatistics pulls the scalar inputs of the formula out of a single
+    evaluated configuration and EvaluateBatch computes the responses for many
+    configurations from arrays of those inputs.  pymdt takes care of making
+    sure the configurations are evaluated, stacking the statistics, creating
+    and installing the responses and caching them (see memoize_evaluation) so
+    that a configuration scored as part of a batch is not scored again when
+    the solver asks for it individually.
+
+    .. code-block:: python
+
+        class BusAvailability(pymdt.metrics.BatchCustomMetric):
+
+            __namespace__ = "MyMetricSpace"
+
+            def ExtractStatistics(self, config) -> dict:
+                mr = pymdt.results.GetMicrogridRealization(self.Microgrid, config)
+                stats = mr.get_BusRealization(self.handles.get(config, "bus")).BusStatistics
+                return {"avail": stats.get_TotalEnergyAvailability(stats.MaxLoadTier)}
+
+            def EvaluateBatch(self, stats: dict) -> np.ndarray:
+                return stats["avail"] * 100.0
+
+    The solver requests responses one configuration at a time through
+    CustomEvaluate, which scores a batch of one.  So during a solve, these
+    metrics gain only the caching and the PRM evaluation happens one
+    configuration at a time as it would for any other custom metric.  The
+    vectorized formula pays off when a caller has many configurations in hand
+    and scores them with a single call to EvaluateConfigurations, for instance
+    to score the final solution set of a run (see
+    pymdt.results.GetFinalSolutionSet) with a metric that was not part of the
+    solve.
+
+    Each object has an entity_handles member named handles that is resolved
+    in ResolveAllReferences and copied by Clone.  Derived classes that need a
+    constructor with a different signature must also override Clone.
+    """
+
+    __namespace__ = "PyMDTMetricSpace"
+
+    CacheSize = 1024
+    """ The maximum number of responses kept for each metric object.
+    """
+
+    def __init__(self, mg: MDT.Microgrid, name: str, units: str=""):
+        super().__init__(mg, name, units)
+        self.handles = entity_handles()
+
+    def ExtractStatistics(self, config: MDT.SiteUpgradeConfiguration) -> dict:
+        """ Extracts the inputs to the formula of this metric from a single
+        configuration.
+
+        The configuration has already been evaluated when this is called.
+
+        Parameters
+        ----------
+        config: MDT.SiteUpgradeConfiguration
+            The configuration from which to extract statistics.
+
+        Returns
+        -------
+        dict:
+            A dictionary of statistic name to numeric value.  Every call must
+            return the same names.
+        """
+        raise NotImplementedError(
+            type(self).__name__ + " must implement ExtractStatistics."
+            )
+
+    def EvaluateBatch(self, stats: dict) -> np.ndarray:
+        """ Computes the responses for a batch of configurations.
+
+        Parameters
+        ----------
+        stats: dict
+            A dictionary of statistic name to an array of the values of that
+            statistic with one entry per configuration in the batch.
+
+        Returns
+        -------
+        np.ndarray:
+            The response values with one entry per configuration in the batch.
+        """
+        raise NotImplementedError(
+            type(self).__name__ + " must implement EvaluateBatch."
+            )
+
+    def EvaluateConfigurations(self, configs, installResp: bool=True) -> list:
+        """ Computes the responses of this metric for many configurations using
+        a single call to EvaluateBatch.
+
+        Configurations whose responses are already cached are not
+        re-evaluated.  The PRM evaluation of the others is completed before
+        the evaluation is timed and is recorded separately under the metric
+        name "PRM evaluation".
+
+        Parameters
+        ----------
+        configs
+            An iterable of MDT.SiteUpgradeConfiguration objects to score.
+        installResp: bool
+            Whether or not to install each response into its configuration.
+
+        Returns
+        -------
+        list:
+            The TMO.Response objects in the same order as configs.
+        """
+        start = time.perf_counter()
+        configs = list(configs)
+        cache = details._get_evaluation_cache(self, self.CacheSize)
+        keys = [pymdt.results.GetConfigurationSignature(c) for c in configs]
+        ret = [cache.get(k) for k in keys]
+        todo = [i for i, r in enumerate(ret) if r is None]
+        lookup = time.perf_counter() - start
+        details._ensure_prm_evaluated(self, [configs[i] for i in todo])
+
+        start = time.perf_counter()
+        if len(todo) > 0:
+            rows = [self.ExtractStatistics(configs[i]) for i in todo]
+
+            stats = {
+                name: np.fromiter(
+                    (row[name] for row in rows), dtype=float, count=len(rows)
+                    )
+                for name in rows[0]
+                }
+
+            vals = np.asarray(self.EvaluateBatch(stats), dtype=float).ravel()
+            if vals.size != len(todo):
+                raise ValueError(
+                    "EvaluateBatch of " + type(self).__name__ + " returned " +
+                    str(vals.size) + " responses for " + str(len(todo)) +
+                    " configurations."
+                    )
+
+            for i, val in zip(todo, vals.tolist()):
+                ret[i] = TMO.Response(val)
+                cache.put(keys[i], ret[i])
+
+        if installResp:
+            for config, resp in zip(configs, ret):
+                details._install_response(self, config, resp)
+
+        details._record_metric_evaluation(
+            self, lookup + time.perf_counter() - start, len(configs),
+            len(configs) - len(todo)
+            )
+        return ret
+
+    def CustomEvaluate(self, config, installResp) -> TMO.Response:
+        """ Computes the response of this metric for a single configuration as
+        a batch of one.  This is how the solver evaluates the metric.
+        """
+        return self.EvaluateConfigurations([config], installResp)[0]
+
+    def Clone(self, forMG, copyUID) -> MDT.IMicrogridEntity:
+        ret = type(self)(forMG, self.StringID, self.Units)
+        ret.CopyPropertiesFrom(self, copyUID)
+        ret.handles = self.handles.copy()
+        return ret
+
+    def ResolveAllReferences(self):
+        self.handles.resolve(self.Site)
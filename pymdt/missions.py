@@ -1,5 +1,10 @@
+import re
+
+import numpy as np
+
 import MDT
 import TMO
+import Common
 
 import pymdt.utils
 import pymdt.specs
@@ -25,11 +30,466 @@ class details:
         pymdt.utils.details._execute_loggable_action(
             parent, "AddChildCanceled", lambda: parent.AddChild(node), **kwargs
             )
+        details._add_children(node, children, **kwargs)
+        return node
+
+    @staticmethod
+    def _add_children(node, children, **kwargs):
+        # All children are added within a single subscription to the cancel
+        # event of the node.
+        children = [c for c in children if c is not None]
+        if len(children) == 0: return
+        def add_all():
+            for child in children: node.AddChild(child)
+        pymdt.utils.details._execute_loggable_action(
+            node, "AddChildCanceled", add_all, **kwargs
+            )
+
+    @staticmethod
+    def _remove_children(node, children, **kwargs) -> bool:
+        # The counterpart of _add_children.  Returns whether all the children
+        # were removed.
+        children = list(children)
+        if len(children) == 0: return True
+        def remove_all():
+            for child in children: node.RemoveChild(child)
+        pymdt.utils.details._execute_loggable_action(
+            node, "RemoveChildCanceled", remove_all, **kwargs
+            )
+        return not any(c in children for c in details._node_children(node))
+
+    # The tokens of a mission expression: an operator name immediately
+    # followed by an opening parenthesis, a quoted name, a bare name, or a
+    # parenthesis or comma.
+    _expr_token = re.compile(
+        r"\s*(?:(?P<op>[A-Za-z0-9_]+)\s*\(|\"(?P<dq>[^\"]*)\"|"
+        r"'(?P<sq>[^']*)'|(?P<name>[^\s(),\"']+)|(?P<punct>[(),]))"
+        )
+
+    _mofn_op = re.compile(r"(\d+)OF(\d+)", re.IGNORECASE)
+
+    @staticmethod
+    def _tokenize(expr: str) -> list:
+        ret = []
+        pos = 0
+        expr = expr.rstrip()
+        while pos < len(expr):
+            m = details._expr_token.match(expr, pos)
+            if m is None:
+                raise ValueError(
+                    "Unexpected character in mission expression at position " +
+                    str(pos) + ": \"" + expr[pos:pos + 20] + "\"."
+                    )
+            if m.group("op") is not None:
+                ret.append(("op", m.group("op"), m.start("op")))
+                ret.append(("(", "(", m.end() - 1))
+            elif m.group("punct") is not None:
+                punct = m.group("punct")
+                ret.append((punct, punct, m.start("punct")))
+            else:
+                kind = "dq" if m.group("dq") is not None else \
+                    "sq" if m.group("sq") is not None else "name"
+                ret.append(("name", m.group(kind), m.start(kind)))
+            pos = m.end()
+        return ret
+
+    @staticmethod
+    def _parse_expression(expr: str, resolve) -> tuple:
+        # Parses into a tree of tuples: ("and", [kids]), ("or", [kids]),
+        # ("mofn", m, [kids]), ("not", kid) or ("leaf", obj).
+        tokens = details._tokenize(expr)
+        pos = 0
+
+        def fail(msg, at):
+            where = tokens[at][2] if at < len(tokens) else len(expr)
+            raise ValueError(
+                msg + " at position " + str(where) + " of mission expression \""
+                + expr + "\"."
+                )
+
+        def expect(kind):
+            nonlocal pos
+            if pos >= len(tokens) or tokens[pos][0] != kind:
+                fail("Expected \"" + kind + "\"", pos)
+            pos += 1
+
+        def parse_node():
+            nonlocal pos
+            if pos >= len(tokens): fail("Unexpected end", pos)
+            kind, text, _ = tokens[pos]
+            if kind == "name":
+                pos += 1
+                return ("leaf", resolve(text))
+            if kind != "op": fail("Unexpected \"" + text + "\"", pos)
+
+            at = pos
+            pos += 1
+            expect("(")
+            kids = []
+            if pos < len(tokens) and tokens[pos][0] == ")":
+                pos += 1
+            else:
+                while True:
+                    kids.append(parse_node())
+                    if pos < len(tokens) and tokens[pos][0] == ",":
+                        pos += 1
+                        continue
+                    expect(")")
+                    break
+
+            op = text.upper()
+            if op in ("AND", "OR"):
+                if not kids: fail(op + " takes at least one operand", at)
+                return (op.lower(), kids)
+            if op == "NOT":
+                if len(kids) != 1: fail("NOT takes exactly one operand", at)
+                return ("not", kids[0])
+            mofn = details._mofn_op.fullmatch(text)
+            if mofn is None: fail("Unknown operator \"" + text + "\"", at)
+            if int(mofn.group(2)) != len(kids):
+                fail(
+                    text + " has " + str(len(kids)) + " operands rather than " +
+                    mofn.group(2), at
+                    )
+            m = int(mofn.group(1))
+            if m < 1 or m > len(kids):
+                fail(text + " requires M to be between 1 and N", at)
+            return ("mofn", m, kids)
+
+        ret = parse_node()
+        if pos != len(tokens):
+            fail("Unexpected \"" + tokens[pos][1] + "\"", pos)
+        return ret
+
+    @staticmethod
+    def _build_name_index(site: MDT.Site) -> dict:
+        # Microgrids, busses and load sections by name and by names qualified
+        # with those of their owners such as "MG1/Bus 3/Load A".  A simple
+        # name used more than once maps to None to mark it ambiguous.
+        ret = {}
+        def add(name, ent):
+            ret[name] = None if name in ret and ret[name] is not ent else ent
+        for mg in site.Microgrids:
+            add(mg.StringID, mg)
+            for bus in mg.get_Busses(False):
+                qbus = mg.StringID + "/" + bus.StringID
+                add(bus.StringID, bus)
+                add(qbus, bus)
+                for ls in bus.LoadSections:
+                    add(ls.StringID, ls)
+                    add(bus.StringID + "/" + ls.StringID, ls)
+                    add(qbus + "/" + ls.StringID, ls)
+        return ret
+
+    @staticmethod
+    def _make_resolver(resolver, mission_function):
+        if callable(resolver): return resolver
+        index = resolver if resolver is not None else \
+            details._build_name_index(mission_function.Site)
+        def resolve(name):
+            if name not in index:
+                raise KeyError(
+                    "No entity named \"" + name + "\" was found while " +
+                    "building a mission from an expression."
+                    )
+            ent = index[name]
+            if ent is None:
+                raise KeyError(
+                    "The name \"" + name + "\" matches more than one entity. " +
+                    "Qualify it with the names of its owners as in " +
+                    "\"Microgrid/Bus\"."
+                    )
+            return ent
+        return resolve
+
+    _logic_node_types = (TMO.AndNode, TMO.OrNode, TMO.MofNNode, TMO.NotNode)
+
+    @staticmethod
+    def _node_children(node) -> list:
+        return list(node.Children)
 
-        for child in children:
-            pymdt.utils.details._execute_loggable_action(
-                node, "AddChildCanceled", lambda: node.AddChild(child), **kwargs
+    @staticmethod
+    def _read_tree(node) -> tuple:
+        # The inverse of _build_tree.  Anything that is not a logic node is a
+        # leaf as is a not node without exactly one child.
+        kids = None
+        if isinstance(node, details._logic_node_types):
+            kids = [details._read_tree(c) for c in details._node_children(node)]
+        if isinstance(node, TMO.AndNode): return ("and", kids)
+        if isinstance(node, TMO.OrNode): return ("or", kids)
+        if isinstance(node, TMO.MofNNode): return ("mofn", node.M, kids)
+        if isinstance(node, TMO.NotNode) and len(kids) == 1:
+            return ("not", kids[0])
+        return ("leaf", node)
+
+    @staticmethod
+    def _node_count(ast: tuple) -> int:
+        if ast[0] == "leaf": return 1
+        if ast[0] == "const": return details._node_count(ast[2])
+        if ast[0] == "not": return 1 + details._node_count(ast[1])
+        return 1 + sum(details._node_count(k) for k in ast[-1])
+
+    @staticmethod
+    def _ast_key(ast: tuple):
+        # A hashable key equal for logically identical subtrees.  Operand
+        # order does not matter for and and or nodes.
+        kind = ast[0]
+        if kind == "leaf": return ast
+        if kind == "const": return ast[:2]
+        if kind == "not": return ("not", details._ast_key(ast[1]))
+        keys = [details._ast_key(k) for k in ast[-1]]
+        if kind == "mofn": return ("mofn", ast[1], tuple(keys))
+        return (kind, frozenset(keys))
+
+    @staticmethod
+    def _simplify(ast: tuple) -> tuple:
+        # A subtree whose result is fixed becomes ("const", value, source)
+        # where source is an original subtree with that result.  Constants
+        # are dropped by or decide their parents and any left over are built
+        # as their source so that nothing relies on how the MDT evaluates
+        # nodes without children.  Such nodes are left as they are.
+        kind = ast[0]
+        if kind in ("leaf", "const"): return ast
+
+        if kind == "not":
+            kid = details._simplify(ast[1])
+            if kid[0] == "not": return kid[1]
+            if kid[0] == "const": return ("const", not kid[1], ast)
+            return ("not", kid)
+
+        if len(ast[-1]) == 0: return ast
+        kids = [details._simplify(k) for k in ast[-1]]
+
+        if kind == "mofn":
+            m = ast[1] - sum(1 for k in kids if k[0] == "const" and k[1])
+            kids = [k for k in kids if k[0] != "const"]
+            if m <= 0: return ("const", True, ast)
+            if m > len(kids): return ("const", False, ast)
+            if m == len(kids): return details._simplify(("and", kids))
+            if m == 1: return details._simplify(("or", kids))
+            return ("mofn", m, kids)
+
+        # For and, True operands are dropped and a False one decides the
+        # result.  The reverse holds for or.
+        identity = kind == "and"
+        flat = []
+        seen = set()
+        for kid in kids:
+            merge = kid[0] == kind and len(kid[1]) > 0
+            for k in kid[1] if merge else [kid]:
+                if k[0] == "const":
+                    if k[1] != identity: return k
+                    continue
+                key = details._ast_key(k)
+                if key in seen: continue
+                seen.add(key)
+                flat.append(k)
+
+        if len(flat) == 0: return ("const", identity, ast)
+        if len(flat) == 1: return flat[0]
+        return (kind, flat)
+
+    @staticmethod
+    def _materialize(ast: tuple) -> tuple:
+        # Replaces the constants of a simplified tree by their sources.
+        kind = ast[0]
+        if kind == "leaf": return ast
+        if kind == "const": return ast[2]
+        if kind == "not": return ("not", details._materialize(ast[1]))
+        kids = [details._materialize(k) for k in ast[-1]]
+        return ("mofn", ast[1], kids) if kind == "mofn" else (kind, kids)
+
+    @staticmethod
+    def _simplify_under(top, **kwargs) -> dict:
+        # The top node itself cannot be replaced, only its children.  Under an
+        # and or an or node the whole subtree can be restructured.  Under any
+        # other node each child subtree is simplified on its own.
+        before = details._read_tree(top)
+        kind = before[0]
+        if kind in ("and", "or"):
+            simple = details._simplify(before)
+            if simple[0] == kind: kids = simple[1]
+            elif simple[0] == "const" and simple[2] is before: kids = before[1]
+            else: kids = [simple]
+            after = (kind, [details._materialize(k) for k in kids])
+        elif kind == "mofn":
+            kids = [details._simplify(k) for k in before[2]]
+            after = ("mofn", before[1], [details._materialize(k) for k in kids])
+        elif kind == "not":
+            after = ("not", details._materialize(details._simplify(before[1])))
+        else:
+            return {"before": 0, "after": 0, "changed": False}
+
+        nbefore = details._node_count(before)
+        nafter = details._node_count(after)
+        changed = nafter != nbefore or \
+            details._ast_key(after) != details._ast_key(before)
+        if changed and not details._replace_children(top, after, **kwargs):
+            return {"before": nbefore, "after": nbefore, "changed": False}
+
+        return {"before": nbefore, "after": nafter, "changed": changed}
+
+    @staticmethod
+    def _replace_children(top, ast: tuple, **kwargs) -> bool:
+        # Rebuilds the children of top from those of ast.  If that raises or
+        # any part of it is canceled, the original children are put back.
+        originals = details._node_children(top)
+        if not details._remove_children(top, originals, **kwargs):
+            details._restore_children(top, originals, **kwargs)
+            return False
+        kids = [ast[1]] if ast[0] == "not" else ast[-1]
+        try:
+            details._add_children(
+                top, [k[1] for k in kids if k[0] == "leaf"], **kwargs
                 )
+            for kid in kids:
+                if kid[0] != "leaf": details._build_tree(top, kid, **kwargs)
+            done = details._ast_key(details._read_tree(top)) == \
+                details._ast_key(ast)
+        except Exception:
+            details._restore_children(top, originals, **kwargs)
+            raise
+        if not done: details._restore_children(top, originals, **kwargs)
+        return done
+
+    @staticmethod
+    def _restore_children(top, originals, **kwargs):
+        details._remove_children(top, details._node_children(top), **kwargs)
+        details._add_children(
+            top, [c for c in originals if c not in details._node_children(top)],
+            **kwargs
+            )
+        errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
+        errLog.AddEntry(
+            Common.Logging.LogCategories.Error,
+            "The simplified mission logic could not be built.  The original " +
+            "logic has been restored."
+            )
+
+    @staticmethod
+    def _availability_ast(mission) -> tuple:
+        if isinstance(mission, str):
+            return details._parse_expression(mission, lambda name: name)
+        return details._read_tree(details._resolve_node_parent(mission))
+
+    @staticmethod
+    def _make_state_lookup(state_matrix, assets) -> tuple:
+        # Returns the time series packed 8 steps to a byte, one row per asset,
+        # the number of steps and a function from leaf entity to row.
+        if isinstance(state_matrix, dict):
+            assets = list(state_matrix.keys())
+            rows = [
+                np.asarray(v, dtype=bool).ravel() for v in state_matrix.values()
+                ]
+            if len({r.size for r in rows}) > 1:
+                raise ValueError(
+                    "All asset state series must have the same length."
+                    )
+            state = np.stack(rows) if rows else np.zeros((0, 0), dtype=bool)
+        else:
+            state = np.asarray(state_matrix, dtype=bool)
+            if state.ndim != 2:
+                raise ValueError(
+                    "The state matrix must have one row per asset and one " +
+                    "column per time step."
+                    )
+            if assets is None or len(assets) != state.shape[0]:
+                raise ValueError(
+                    "The assets corresponding to the rows of the state " +
+                    "matrix must be supplied, one per row."
+                    )
+
+        index = {}
+        for i, asset in enumerate(assets):
+            index[asset] = i
+            name = getattr(asset, "StringID", None)
+            if name is not None: index.setdefault(name, i)
+
+        def lookup(leaf):
+            i = index.get(leaf)
+            if i is None: i = index.get(getattr(leaf, "StringID", None))
+            if i is None:
+                raise KeyError(
+                    "No state series was supplied for mission entity \"" +
+                    str(getattr(leaf, "StringID", leaf)) + "\"."
+                    )
+            return i
+
+        return np.packbits(state, axis=-1), state.shape[-1], lookup
+
+    @staticmethod
+    def _evaluate_packed(ast: tuple, packed: np.ndarray, lookup, memo: dict) -> np.ndarray:
+        kind = ast[0]
+        nbytes = packed.shape[-1]
+        if kind == "const":
+            return np.full(nbytes, 0xFF if ast[1] else 0, dtype=np.uint8)
+
+        if kind == "leaf":
+            leaf = ast[1]
+            if not isinstance(leaf, str) and \
+                isinstance(leaf, MDT.MissionFunction):
+                return details._evaluate_packed(
+                    details._read_tree(leaf.TopNode), packed, lookup, memo
+                    )
+            i = lookup(leaf)
+            return packed[i]
+
+        key = details._ast_key(ast)
+        ret = memo.get(key)
+        if ret is not None: return ret
+
+        if kind == "not":
+            ret = ~details._evaluate_packed(ast[1], packed, lookup, memo)
+        else:
+            kids = [
+                details._evaluate_packed(k, packed, lookup, memo)
+                for k in ast[-1]
+                ]
+            if kind == "and":
+                ret = np.full(nbytes, 0xFF, dtype=np.uint8)
+                for k in kids: ret = ret & k
+            elif kind == "or":
+                ret = np.zeros(nbytes, dtype=np.uint8)
+                for k in kids: ret = ret | k
+            else:
+                # at_least[j] has a bit set where at least j of the children
+                # seen so far are up.
+                m = ast[1]
+                if m <= 0: return np.full(nbytes, 0xFF, dtype=np.uint8)
+                at_least = [np.full(nbytes, 0xFF, dtype=np.uint8)] + [
+                    np.zeros(nbytes, dtype=np.uint8) for _ in range(m)
+                    ]
+                for k in kids:
+                    for j in range(m, 0, -1):
+                        at_least[j] |= at_least[j - 1] & k
+                ret = at_least[m]
+
+        memo[key] = ret
+        return ret
+
+    @staticmethod
+    def _outage_runs(up: np.ndarray) -> np.ndarray:
+        edges = np.diff(np.concatenate(([0], (~up).view(np.int8), [0])))
+        return np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+    @staticmethod
+    def _build_tree(parent, ast, **kwargs):
+        kind = ast[0]
+        if kind == "leaf":
+            details._add_children(parent, [ast[1]], **kwargs)
+            return ast[1]
+
+        if kind == "and": node = MakeAndNode(parent, [], **kwargs)
+        elif kind == "or": node = MakeOrNode(parent, [], **kwargs)
+        elif kind == "mofn": node = MakeMofNNode(parent, [], ast[1], **kwargs)
+        else: node = MakeNotNode(parent, None, **kwargs)
+
+        kids = [ast[1]] if kind == "not" else ast[-1]
+        details._add_children(
+            node, [k[1] for k in kids if k[0] == "leaf"], **kwargs
+            )
+        for kid in kids:
+            if kid[0] != "leaf": details._build_tree(node, kid, **kwargs)
         return node
 
     @staticmethod
@@ -248,4 +708,179 @@ def MakeNotNode(parent, child, **kwargs) -> TMO.NotNode:
     parent = details._resolve_node_parent(parent)
     return details._load_and_assign_node(
         TMO.NotNode(parent), parent, [child], **kwargs
-        )
\ No newline at end of file
+        )
+
+
+def BuildFromExpression(mission_function: MDT.MissionFunction, expr: str, resolver=None, **kwargs):
+    """ Builds the logic of a mission function from a boolean expression.
+
+    The expression is made of names and the operators AND(...), OR(...),
+    NOT(...) and mOFn(...) such as 2OF3(...) which is satisfied when at least
+    m of its n operands are (m must be between 1 and n and n must be the
+    number of operands).  AND and OR take at least one operand and NOT takes
+    exactly one.  Operator names are not case sensitive.  Names
+    that contain spaces, commas or parentheses must be quoted with single or
+    double quotes.  For example:
+
+    .. code-block:: python
+
+        pymdt.missions.BuildFromExpression(
+            mf, "AND(OR(bus1, bus2), 2OF3(a, b, c), NOT('Load A'))"
+            )
+
+    The whole expression is parsed and every name resolved before any node is
+    created so an error leaves the mission function unchanged.
+
+    Parameters
+    ----------
+    mission_function: MDT.MissionFunction
+        The mission function into which to build the logic.  The root of the
+        expression is added to its top node.
+    expr: str
+        The expression to build.
+    resolver
+        How names are turned into the entities added to the tree.  This can be
+        a callable that accepts a name and returns the entity, a dictionary of
+        entities by name, or None in which case the microgrids, busses and load
+        sections of the site of the mission function are used.  Those can be
+        referred to by name or, if the name is not unique, by a name qualified
+        with the names of owners separated by slashes as in
+        "Microgrid 1/Bus 3/Load A".
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        err_log: Common.Logging.Log
+            The log into which to record any errors encountered during the
+            building of the tree.  If this argument is not provided, messages
+            will be recorded into the pymdt.GlobalErrorLog instance.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated during this operation (if any).
+
+    Returns
+    -------
+    The node at the root of the expression or, if the expression is a single
+    name, the entity it resolves to.
+    """
+    resolve = details._make_resolver(resolver, mission_function)
+    ast = details._parse_expression(expr, resolve)
+    return details._build_tree(
+        details._resolve_node_parent(mission_function), ast, **kwargs
+        )
+
+def Simplify(mission, **kwargs) -> dict:
+    """ Simplifies the logic of a mission or mission function without changing
+    what it means.
+
+    Nested nodes of the same type are merged, and and or nodes with a single
+    child are replaced by the child, repeated children of and and or nodes are
+    removed, double negations are removed and M of N nodes with M equal to 1
+    or N are turned into or and and nodes respectively.  Nodes whose result is
+    fixed (such as an M of N node with M greater than N) are folded into
+    their parents.  Nodes without children are left as they are.  The logic is
+    only rebuilt if something changes.  If the simplified logic cannot be
+    built, the original is put back and an error is logged.  Pass
+    simplify_missions=True to pymdt.solving.RunIslandedSolver to simplify all
+    mission functions of the site before solving.
+
+    Parameters
+    ----------
+    mission
+        The MDT.Mission, all of whose mission functions are simplified, or the
+        MDT.MissionFunction to simplify.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        err_log: Common.Logging.Log
+            The log into which to record any errors encountered during the
+            rebuilding of the logic.  If this argument is not provided,
+            messages will be recorded into the pymdt.GlobalErrorLog instance.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated during this operation (if any).
+
+    Returns
+    -------
+    dict:
+        A dictionary with the keys before and after holding the number of
+        nodes (including the entities at the leaves) before and after
+        simplification and changed indicating whether anything was rebuilt.
+    """
+    if isinstance(mission, MDT.Mission):
+        mfs = details._node_children(mission.MissionFunctions)
+        tops = [mission.MissionFunctions] + [
+            mf.TopNode for mf in mfs if isinstance(mf, MDT.MissionFunction)
+            ]
+    else:
+        tops = [details._resolve_node_parent(mission)]
+
+    ret = {"before": 0, "after": 0, "changed": False}
+    for top in tops:
+        rep = details._simplify_under(top, **kwargs)
+        ret["before"] += rep["before"]
+        ret["after"] += rep["after"]
+        ret["changed"] = ret["changed"] or rep["changed"]
+    return ret
+
+def EvaluateAvailability(mission, state_matrix, assets=None, period_hours: float=1.0) -> dict:
+    """ Computes when a mission is satisfied given when each of the entities
+    it depends on is up, without running the solver.
+
+    The logic of the mission is evaluated for all time steps at once on time
+    series packed 8 steps to a byte so that millions of steps can be screened
+    quickly.
+
+    .. code-block:: python
+
+        res = pymdt.missions.EvaluateAvailability(
+            mf, {"Bus 1": bus1_up, "Bus 2": bus2_up, "Load A": load_a_up}
+            )
+        print(res["availability"], res["max_outage_hours"])
+
+    Parameters
+    ----------
+    mission
+        The MDT.Mission, MDT.MissionFunction or logic node to evaluate or an
+        expression in the form accepted by BuildFromExpression whose names are
+        the keys of the state series.
+    state_matrix
+        The up (True or non-zero) or down state of each entity at each time
+        step.  This can be a dictionary of 1-D series keyed by entity or
+        entity name or a 2-D array with one row per entity in which case
+        assets must be supplied.
+    assets
+        The entities or entity names corresponding to the rows of a 2-D
+        state_matrix.
+    period_hours: float
+        The duration of each time step in hours used to report outage
+        durations.
+
+    Returns
+    -------
+    dict:
+        A dictionary with the keys up (a boolean array indicating whether the
+        mission is satisfied at each step), availability (the fraction of
+        steps satisfied), down_steps, outages (the number of separate periods
+        during which the mission is not satisfied), mean_outage_hours and
+        max_outage_hours.
+    """
+    ast = details._availability_ast(mission)
+    packed, steps, lookup = details._make_state_lookup(state_matrix, assets)
+    up = np.unpackbits(
+        details._evaluate_packed(ast, packed, lookup, {}), count=steps
+        ).astype(bool)
+
+    runs = details._outage_runs(up)
+    down = steps - int(np.count_nonzero(up))
+    return {
+        "up": up,
+        "availability": 1.0 - down / steps if steps > 0 else float("nan"),
+        "down_steps": down,
+        "outages": int(runs.size),
+        "mean_outage_hours": float(runs.mean()) * period_hours
+            if runs.size > 0 else 0.0,
+        "max_outage_hours": float(runs.max()) * period_hours
+            if runs.size > 0 else 0.0
+        }
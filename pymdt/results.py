@@ -220,6 +220,29 @@ def GetVariableSelections(config: MDT.SiteUpgradeConfiguration):
 
     return ret    
 
+def GetConfigurationSignature(config: MDT.SiteUpgradeConfiguration) -> tuple:
+    """ Builds a hashable signature of the variable selections made in the
+    supplied configuration.
+
+    Two configurations that select the same specification or realization for
+    every variable entity have equal signatures.  This makes the signature
+    suitable as a key for caching anything computed from a configuration.
+
+    Parameters
+    ----------
+    config: MDT.SiteUpgradeConfiguration
+        The configuration for which to build a signature.
+
+    Returns
+    -------
+    tuple:
+        A sorted tuple of (entity GUID, selection GUID) string pairs.
+    """
+    return tuple(sorted(
+        (ent.GUID.ToString(), "" if sel is None else sel.GUID.ToString())
+        for ent, sel in GetVariableSelections(config).items()
+        ))
+
 def GetFinalSolutionSet(sri: TMO.SolverRunInfo) -> TMO.IterationData:
     """    
     One can use the .Configurations property of the returned IterationData
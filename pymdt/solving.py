@@ -1,3 +1,5 @@
+import time
+
 import System
 import Common.Logging
 from System import Exception as SYSEX
@@ -5,11 +7,19 @@ from System import Exception as SYSEX
 import MDT
 
 import pymdt.utils
+import pymdt.metrics
+import pymdt.missions
 
 class details:
 
+    _last_run_timings = {}
+
     @staticmethod
     def execute_configured_solver(rInfo: MDT.SolverRunInfo):
+        pymdt.metrics.ResetMetricTimings()
+        timings = details._last_run_timings
+        timings.clear()
+        start = time.perf_counter()
         MDT.PRM.PRMEvaluator.INSTANCE.ResetNativePRM(rInfo.PRMSettings, 0)
         MDT.Driver.INSTANCE.get_SolverRunInfos().Add(rInfo)
         rvm = MDT.ResultViewManager()
@@ -19,10 +29,15 @@ class details:
         solver = rInfo.Solver
     
         runLog = Common.Logging.Log()
+        timings["prepare"] = time.perf_counter() - start
         try:
-            solver.Setup(runLog)
-            solver.Run(runLog)
-            solver.TakeDown(runLog)
+            for phase, action in (
+                ("setup", solver.Setup), ("run", solver.Run),
+                ("take_down", solver.TakeDown)
+                ):
+                start = time.perf_counter()
+                action(runLog)
+                timings[phase] = time.perf_counter() - start
         except SYSEX as e:
             runLog.AddEntry(Common.Logging.LogCategories.Error, str(e))
         except BaseException as e:
@@ -46,9 +61,32 @@ def MakeParameterStudySolver(psConfig: MDT.ParameterStudyConfig, **kwargs) -> MD
         drv.Solver.FitnessAssessor.Clone(False)
     return drv.ParameterStudySolver
 
-def RunIslandedSolver() -> tuple[MDT.SolverRunInfo, Common.Logging.Log]:
-    rInfo = MDT.Driver.INSTANCE.GetCurrentRunInfo(
-        MDT.Driver.AnalysisTypeEnum.ISLANDED
-        )
-    return details.execute_configured_solver(rInfo)
-        
\ No newline at end of file
+def RunIslandedSolver(simplify_missions: bool=False) -> tuple[MDT.SolverRunInfo, Common.Logging.Log]:
+    drv = MDT.Driver.INSTANCE
+    if simplify_missions:
+        start = time.perf_counter()
+        for mf in drv.Site.MissionFunctions: pymdt.missions.Simplify(mf)
+        simplify_time = time.perf_counter() - start
+
+    rInfo = drv.GetCurrentRunInfo(MDT.Driver.AnalysisTypeEnum.ISLANDED)
+    ret = details.execute_configured_solver(rInfo)
+    if simplify_missions: details._last_run_timings["simplify"] = simplify_time
+    return ret
+        
+def GetLastRunTimings() -> dict:
+    """ Returns the wall clock time in seconds spent in each phase of the most
+    recent run of RunIslandedSolver.
+
+    Compare the run time to the total time of the custom metrics reported by
+    pymdt.metrics.MetricTimingTable to see how much of a solve is spent in
+    Python code and how much in the reliability simulation and built in
+    metrics.
+
+    Returns
+    -------
+    dict:
+        A dictionary with any of the keys simplify (if missions were
+        simplified), prepare, setup, run and take_down.  A phase that failed
+        or was not reached is absent.
+    """
+    return dict(details._last_run_timings)
@@ -1,12 +1,599 @@
+import os
+import csv
+import json
+import time
+import shutil
+import contextlib
+import collections
+import numpy as np
+
+from enum import Enum
+
 import System
+from System import Exception as SYSEX
 
 import pymdt.utils
 
 import MDT
 import Common
 
+class spec_types(Enum):
+    """ An enumeration of the types of specifications held in the master lists
+    of the MDT.  The value of each member is the name used by the MDT for that
+    type (as in the BatterySpecifications list).
+    """
+
+    line = "Line"
+    """ Indicates line specifications (MDT.LineSpec).
+    """
+
+    switch = "Switch"
+    """ Indicates switch specifications (MDT.SwitchSpec).
+    """
+
+    transformer = "Transformer"
+    """ Indicates transformer specifications (MDT.TransformerSpec).
+    """
+
+    diesel_tank = "DieselTank"
+    """ Indicates diesel tank specifications (MDT.DieselTankSpec).
+    """
+
+    propane_tank = "PropaneTank"
+    """ Indicates propane tank specifications (MDT.PropaneTankSpec).
+    """
+
+    diesel_generator = "DieselGenerator"
+    """ Indicates diesel generator specifications (MDT.DieselGeneratorSpec).
+    """
+
+    propane_generator = "PropaneGenerator"
+    """ Indicates propane generator specifications (MDT.PropaneGeneratorSpec).
+    """
+
+    natural_gas_generator = "NaturalGasGenerator"
+    """ Indicates natural gas generator specifications
+    (MDT.NaturalGasGeneratorSpec).
+    """
+
+    solar_generator = "SolarGenerator"
+    """ Indicates solar generator specifications (MDT.SolarGeneratorSpec).
+    """
+
+    wind_generator = "WindGenerator"
+    """ Indicates wind generator specifications (MDT.WindGeneratorSpec).
+    """
+
+    hydro_generator = "HydroGenerator"
+    """ Indicates hydro generator specifications (MDT.HydroGeneratorSpec).
+    """
+
+    inverter = "Inverter"
+    """ Indicates inverter specifications (MDT.InverterSpec).
+    """
+
+    battery = "Battery"
+    """ Indicates battery specifications (MDT.BatterySpec).
+    """
+
+    ups = "UPS"
+    """ Indicates uninterruptible power supply specifications (MDT.UPSSpec).
+    """
+
+class spec_transaction:
+    """ A record of the specification changes made within a bulk_specs block.
+
+    Instances of this class are created by bulk_specs and should not be
+    created directly.
+    """
+
+    def __init__(self):
+        self.added = []
+        """ The (type, specification) pairs successfully added to the master
+        lists during the block.
+        """
+
+        self.changed = []
+        """ The (type, specification) pairs of existing specifications that
+        were modified during the block.  These changes are not undone if the
+        block is rolled back.
+        """
+
+        self.rejected = []
+        """ The (type, specification) pairs whose addition was canceled by the
+        MDT (for example because of a duplicate name).
+        """
+
+        self.sync_requested = False
+        """ Whether or not a database sync was requested and deferred during
+        the block.
+        """
+
+        self.synced = False
+        """ Whether or not the database was synchronized at the end of the
+        block.
+        """
+
+        self.rolled_back = False
+        """ Whether or not the additions made during the block were removed
+        because the block raised an exception.
+        """
+
+        self.elapsed = 0.0
+        """ The wall clock time in seconds spent in the block including the
+        final sync.
+        """
+
+    def __str__(self):
+        return (
+            str(len(self.added)) + " added, " + str(len(self.changed)) +
+            " changed, " + str(len(self.rejected)) + " rejected in " +
+            "{:.3f}".format(self.elapsed) + " s" +
+            (" (rolled back)" if self.rolled_back else "")
+            )
+
+class spec_snapshot:
+    """ The membership of the specification master lists at a point in time.
+
+    Instances of this class are created by Snapshot and consumed by Restore and
+    should not be created directly.
+    """
+
+    def __init__(self):
+        self.members = {}
+        """ A dictionary mapping each spec_types member to a dictionary of the
+        specifications of that type keyed by GUID string.
+        """
+
+        self.path = None
+        """ The directory into which the snapshot was also written or None if
+        it is held only in memory.
+        """
+
 class details:
+
+    # The stack of open bulk_specs transactions.  The first is the outermost.
+    _spec_transactions = []
+
+    # The specs added, modified, or deleted through pymdt since the last sync
+    # keyed by (type, GUID).  Values are [type, spec, state] where state is one
+    # of "added", "modified", or "deleted".
+    _pending_spec_changes = {}
+
+    # A record of the most recent database syncs and their timing.
+    _spec_sync_history = collections.deque(maxlen=1000)
+
+    # The separator used between the items of array valued catalog columns.
+    CATALOG_ARRAY_SEPARATOR = ";"
+
+    @staticmethod
+    def _spec_list(specType: str):
+        return getattr(MDT.Driver.INSTANCE, "get_" + specType + "Specifications")()
+
+    # Columnar snapshots of the spec master lists keyed by spec_types member.
+    # Each is a dictionary holding the list of specs under "specs" and a numpy
+    # array per numeric column.  They are discarded whenever the master lists
+    # may have changed and rebuilt on the next query.
+    _spec_indices = {}
+
+    SPEC_INDEX_COLUMNS = (
+        "capacity", "capital_cost", "op_cost", "weight", "volume"
+        )
+
+    @staticmethod
+    def _spec_capacity(spec) -> float:
+        # Storage is sized by energy rather than power.
+        for prop in ("EnergyCapacity", "Capacity"):
+            if hasattr(spec, prop): return float(getattr(spec, prop))
+        return np.nan
+
+    @staticmethod
+    def _invalidate_spec_index(kind: spec_types = None):
+        if kind is None: details._spec_indices.clear()
+        else: details._spec_indices.pop(kind, None)
+
+    @staticmethod
+    def _get_spec_index(kind: spec_types) -> dict:
+        idx = details._spec_indices.get(kind)
+        if idx is not None: return idx
+
+        specs = list(details._spec_list(kind.value))
+        n = len(specs)
+        cap = np.empty(n)
+        cost = np.empty(n)
+        opc = np.empty(n)
+        wgt = np.empty(n)
+        vol = np.empty(n)
+        for i, sp in enumerate(specs):
+            cap[i] = details._spec_capacity(sp)
+            cost[i] = details._to_float(sp.Cost)
+            opc[i] = details._to_float(sp.OperationalCost)
+            wgt[i] = sp.Weight
+            vol[i] = sp.Volume
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cpc = np.where(cap > 0.0, cost / cap, np.inf)
+
+        idx = {
+            "specs": specs, "capacity": cap, "capital_cost": cost,
+            "op_cost": opc, "weight": wgt, "volume": vol,
+            "cost_per_capacity": cpc
+            }
+        details._spec_indices[kind] = idx
+        return idx
+
+    # The criteria by which specifications of each type are pruned if none are
+    # supplied.  Switches and inverters have no capacity so they are compared
+    # by cost, weight, and volume alone.
+    _cost_prune_criteria = {
+        "capital_cost": "min", "op_cost": "min", "weight": "min", "volume": "min"
+        }
+
+    _sized_prune_criteria = {"capacity": "max", **_cost_prune_criteria}
+
+    _fossil_gen_prune_criteria = {
+        **_sized_prune_criteria, "efficiencies": "max"
+        }
+
+    _storage_prune_criteria = {
+        **_sized_prune_criteria, "charge_efficiencies": "max",
+        "discharge_efficiencies": "max", "max_charge_rate": "max",
+        "max_discharge_rate": "max"
+        }
+
+    DEFAULT_PRUNE_CRITERIA = {
+        spec_types.line: _sized_prune_criteria,
+        spec_types.switch: _cost_prune_criteria,
+        spec_types.transformer: _sized_prune_criteria,
+        spec_types.diesel_tank: _sized_prune_criteria,
+        spec_types.propane_tank: _sized_prune_criteria,
+        spec_types.diesel_generator: _fossil_gen_prune_criteria,
+        spec_types.propane_generator: _fossil_gen_prune_criteria,
+        spec_types.natural_gas_generator: _fossil_gen_prune_criteria,
+        spec_types.solar_generator: _sized_prune_criteria,
+        spec_types.wind_generator: _sized_prune_criteria,
+        spec_types.hydro_generator: _sized_prune_criteria,
+        spec_types.inverter: _cost_prune_criteria,
+        spec_types.battery: _storage_prune_criteria,
+        spec_types.ups: _storage_prune_criteria
+        }
+
+    _spec_column_getters = {
+        "capacity": lambda sp: details._spec_capacity(sp),
+        "capital_cost": lambda sp: details._to_float(sp.Cost),
+        "op_cost": lambda sp: details._to_float(sp.OperationalCost),
+        "weight": lambda sp: sp.Weight,
+        "volume": lambda sp: sp.Volume,
+        "max_charge_rate": lambda sp: sp.MaxChargeRate,
+        "max_discharge_rate": lambda sp: sp.MaxDischargeRate
+        }
+
+    # Criteria whose values are performance curves.  Curves are compared at
+    # PRUNE_CURVE_POINTS evenly spaced fractions of load so that one spec only
+    # dominates another if its curve is nowhere worse.
+    _spec_curve_getters = {
+        "efficiencies": lambda sp: sp.get_EfficiencyValues(),
+        "charge_efficiencies": lambda sp: sp.get_ChargeEfficiencies(),
+        "discharge_efficiencies": lambda sp: sp.get_DischargeEfficiencies()
+        }
+
+    PRUNE_CURVE_POINTS = 11
+
+    @staticmethod
+    def _default_prune_criteria(specs: list) -> dict:
+        kinds = {details._spec_type_of(sp) for sp in specs}
+        if len(kinds) != 1:
+            raise ValueError(
+                "Specifications of different types cannot be pruned using the "
+                "default criteria.  Supply the criteria to use."
+                )
+        return details.DEFAULT_PRUNE_CRITERIA[kinds.pop()]
+
+    @staticmethod
+    def _curve_columns(curves: list) -> np.ndarray:
+        grid = np.linspace(0.0, 1.0, details.PRUNE_CURVE_POINTS)
+        ret = np.full((len(curves), grid.size), np.nan)
+        for i, c in enumerate(curves):
+            c = pymdt.utils.details._as_float_array(c)
+            if c.size > 0:
+                ret[i] = np.interp(grid, np.linspace(0.0, 1.0, c.size), c)
+        return ret
+
+    @staticmethod
+    def _criteria_matrix(specs: list, criteria: dict) -> np.ndarray:
+        # Builds an (n, k) matrix oriented such that smaller is always better.
+        # Curve criteria contribute several columns.
+        cols = []
+        for key, sense in criteria.items():
+            if sense not in ("min", "max"):
+                raise ValueError(
+                    "The sense of criterion " + str(key) + " must be \"min\" "
+                    "or \"max\", not " + str(sense) + "."
+                    )
+            curve = None if callable(key) else details._spec_curve_getters.get(key)
+            if curve is not None:
+                col = details._curve_columns([curve(sp) for sp in specs])
+            else:
+                get = key if callable(key) else details._spec_column_getters.get(
+                    key, lambda sp, k=key: getattr(sp, k)
+                    )
+                col = np.fromiter(
+                    (float(get(sp)) for sp in specs), np.float64,
+                    count=len(specs)
+                    )[:, None]
+            if np.isnan(col).any():
+                raise ValueError(
+                    "Criterion " + str(key) + " is not defined for all of the "
+                    "specifications being pruned."
+                    )
+            cols.append(-col if sense == "max" else col)
+        return np.hstack(cols)
+
+    @staticmethod
+    def _pareto_mask(m: np.ndarray, block: int = 256) -> np.ndarray:
+        # Row i is dominated if some row j is no worse in every column and
+        # strictly better in at least one.  Rows are compared in blocks to
+        # bound the size of the (block, n, k) intermediates.
+        n = m.shape[0]
+        keep = np.ones(n, dtype=bool)
+        for s in range(0, n, block):
+            rows = m[s:s + block, None, :]
+            no_worse = np.all(m[None, :, :] <= rows, axis=2)
+            better = np.any(m[None, :, :] < rows, axis=2)
+            keep[s:s + block] = ~np.any(no_worse & better, axis=1)
+        return keep
+
+    @staticmethod
+    def _resolve_spec_type(kind) -> spec_types:
+        if isinstance(kind, spec_types): return kind
+        for st in spec_types:
+            if kind == st.value: return st
+        return spec_types[kind]
+
+    @staticmethod
+    def _to_float(v) -> float:
+        # System.Decimal values (costs) do not convert directly.
+        try:
+            return float(v)
+        except TypeError:
+            return System.Decimal.ToDouble(v)
+
+    # Catalog columns are named for the Make*Specification arguments they feed.
+    # Each entry is (column, value kind, getter) where the value kind is "s"
+    # (string), "f" (float) or "a" (array of float) and the getter reads the
+    # column value from an existing spec for export (None if not exportable).
+    _basic_columns = [
+        ("name", "s", lambda sp: sp.StringID),
+        ("guid", "s", lambda sp: sp.GUID.ToString()),
+        ("capital_cost", "f", lambda sp: details._to_float(sp.Cost)),
+        ("op_cost", "f", lambda sp: details._to_float(sp.OperationalCost)),
+        ("weight", "f", lambda sp: sp.Weight),
+        ("volume", "f", lambda sp: sp.Volume),
+        ("notes", "s", lambda sp: sp.Notes)
+        ]
+
+    _capacity_columns = [("capacity", "f", lambda sp: sp.Capacity)]
+
+    _impedance_columns = [
+        ("resistance", "f", lambda sp: sp.Impedance.Real),
+        ("reactance", "f", lambda sp: sp.Impedance.Imaginary)
+        ]
+
+    _voltage_columns = [
+        ("real", "f", lambda sp: sp.Voltage.Real),
+        ("imaginary", "f", lambda sp: sp.Voltage.Imaginary)
+        ]
+
+    _fossil_gen_columns = [
+        ("efficiencies", "a", lambda sp: sp.get_EfficiencyValues()),
+        ("start_probabilities", "a", lambda sp: sp.get_StartProbabilities()),
+        ("startup_time", "f", lambda sp: sp.StartupTime),
+        ("recoverable_heat_rate", "f", lambda sp: sp.RecoverableHeatRate)
+        ]
+
+    _storage_columns = [
+        ("charge_efficiencies", "a", lambda sp: sp.get_ChargeEfficiencies()),
+        ("discharge_efficiencies", "a",
+            lambda sp: sp.get_DischargeEfficiencies()),
+        ("max_charge_rate", "f", lambda sp: sp.MaxChargeRate),
+        ("max_discharge_rate", "f", lambda sp: sp.MaxDischargeRate),
+        ("energy_capacity", "f", lambda sp: sp.EnergyCapacity),
+        ("min_state_of_charge", "f", lambda sp: sp.MinStateOfCharge),
+        ("max_state_of_charge", "f", lambda sp: sp.MaxStateOfCharge),
+        ("desired_state_of_charge", "f", lambda sp: sp.DesiredStateOfCharge)
+        ]
+
+    _catalog_columns = {
+        spec_types.line: _basic_columns + _capacity_columns + _impedance_columns,
+        spec_types.switch: _basic_columns + _impedance_columns,
+        spec_types.transformer:
+            _basic_columns + _capacity_columns + _impedance_columns,
+        spec_types.diesel_tank: _basic_columns + _capacity_columns,
+        spec_types.propane_tank: _basic_columns + _capacity_columns,
+        spec_types.diesel_generator: _basic_columns + _capacity_columns +
+            _voltage_columns + _fossil_gen_columns,
+        spec_types.propane_generator: _basic_columns + _capacity_columns +
+            _voltage_columns + _fossil_gen_columns,
+        spec_types.natural_gas_generator: _basic_columns + _capacity_columns +
+            _voltage_columns + _fossil_gen_columns,
+        spec_types.solar_generator:
+            _basic_columns + _capacity_columns + _voltage_columns,
+        spec_types.wind_generator:
+            _basic_columns + _capacity_columns + _voltage_columns,
+        spec_types.hydro_generator:
+            _basic_columns + _capacity_columns + _voltage_columns,
+        spec_types.inverter: _basic_columns,
+        spec_types.battery: _basic_columns + _voltage_columns + _storage_columns,
+        spec_types.ups: _basic_columns + _voltage_columns + _storage_columns
+        }
+
+    _catalog_makers = {
+        spec_types.line: lambda **kw: MakeLineSpecification(**kw),
+        spec_types.switch: lambda **kw: MakeSwitchSpecification(**kw),
+        spec_types.transformer: lambda **kw: MakeTransformerSpecification(**kw),
+        spec_types.diesel_tank: lambda **kw: MakeDieselTankSpecification(**kw),
+        spec_types.propane_tank: lambda **kw: MakePropaneTankSpecification(**kw),
+        spec_types.diesel_generator:
+            lambda **kw: MakeDieselGeneratorSpecification(**kw),
+        spec_types.propane_generator:
+            lambda **kw: MakePropaneGeneratorSpecification(**kw),
+        spec_types.natural_gas_generator:
+            lambda **kw: MakeNaturalGasGeneratorSpecification(**kw),
+        spec_types.solar_generator:
+            lambda **kw: MakeSolarGeneratorSpecification(**kw),
+        spec_types.wind_generator:
+            lambda **kw: MakeWindGeneratorSpecification(**kw),
+        spec_types.hydro_generator:
+            lambda **kw: MakeHydroGeneratorSpecification(**kw),
+        spec_types.inverter: lambda **kw: MakeInverterSpecification(**kw),
+        spec_types.battery: lambda **kw: MakeBatterySpecification(**kw),
+        spec_types.ups: lambda **kw: MakeUPSSpecification(**kw)
+        }
+
+    @staticmethod
+    def _read_catalog_rows(path_or_rows) -> list:
+        if type(path_or_rows) is str:
+            with open(path_or_rows, newline="") as fp:
+                return list(csv.DictReader(fp))
+        return list(path_or_rows)
+
+    @staticmethod
+    def _catalog_row_to_kwargs(kind: spec_types, row: dict, errLog) -> dict:
+        cols = {c[0]: c[1] for c in details._catalog_columns[kind]}
+        ret = {}
+        for key, val in row.items():
+            if key is None: continue
+            key = key.strip()
+            vk = cols.get(key)
+            if vk is None:
+                errLog.AddEntry(
+                    Common.Logging.LogCategories.Warning,
+                    "Ignoring unrecognized " + kind.name + " catalog column \"" +
+                    key + "\"."
+                    )
+                continue
+            if val is None or (type(val) is str and val.strip() == ""): continue
+            if vk == "s":
+                ret[key] = str(val)
+            elif vk == "f":
+                ret[key] = float(val)
+            elif type(val) is str:
+                ret[key] = [
+                    float(v) for v in val.split(details.CATALOG_ARRAY_SEPARATOR)
+                    if v.strip() != ""
+                    ]
+            else:
+                ret[key] = [float(v) for v in val]
+        return ret
+
+    @staticmethod
+    def _format_catalog_value(vk: str, val) -> str:
+        if val is None: return ""
+        if vk == "a":
+            return details.CATALOG_ARRAY_SEPARATOR.join(
+                repr(float(v)) for v in
+                pymdt.utils.details._as_float_array(val).tolist()
+                )
+        if vk == "f": return repr(float(val))
+        return str(val)
+
+    @staticmethod
+    def _spec_type_of(spec) -> spec_types:
+        # MDT spec classes are named for their type as in MDT.BatterySpec.
+        name = spec.GetType().Name
+        if name.endswith("Spec"): name = name[:-4]
+        return details._resolve_spec_type(name)
+
+    @staticmethod
+    def _record_spec_change(specType: str, spec, state: str):
+        key = (specType, spec.GUID.ToString())
+        ent = details._pending_spec_changes.get(key)
+        if ent is None:
+            details._pending_spec_changes[key] = [specType, spec, state]
+        elif ent[2] == "added":
+            # Modifying a new spec leaves it new.  Deleting one means there
+            # is nothing to save for it at all.
+            if state == "deleted": del details._pending_spec_changes[key]
+        else:
+            ent[2] = state
+
+    @staticmethod
+    def _note_spec_changed(specType: str, spec):
+        details._record_spec_change(specType, spec, "modified")
+        if details._spec_transactions:
+            details._spec_transactions[-1].changed.append((specType, spec))
+
+    SNAPSHOT_MANIFEST_FILE = "manifest.json"
+    SNAPSHOT_VERSION = 1
+
+    @staticmethod
+    def _read_snapshot_manifest(path: str) -> dict:
+        with open(os.path.join(path, details.SNAPSHOT_MANIFEST_FILE)) as fp:
+            man = json.load(fp)
+        if man.get("version") != details.SNAPSHOT_VERSION:
+            raise ValueError(
+                "Unsupported specification snapshot version " +
+                str(man.get("version")) + " in " + path
+                )
+        return man
+
+    @staticmethod
+    def _catalog_size() -> int:
+        return sum(details._spec_list(st.value).Count for st in spec_types)
+
+    @staticmethod
+    def _rollback_spec_transaction(trans: spec_transaction, **kwargs):
+        errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
+        passed = {k: kwargs[k] for k in ("err_log", "undos") if k in kwargs}
+        for specType, spec in reversed(trans.added):
+            try:
+                details._execute_spec_remove(specType, spec, **passed)
+            except SYSEX as e:
+                errLog.AddEntry(
+                    Common.Logging.LogCategories.Error,
+                    "Unable to remove " + spec.GetTypeAndIDString() +
+                    " during rollback: " + e.Message
+                    )
+        details._invalidate_spec_index()
+        trans.rolled_back = True
     
+    @staticmethod
+    def _resample_curve(vals: np.ndarray, n: int, **kwargs) -> np.ndarray:
+        # Curve points are evenly spaced over the operating range (0-100%) so
+        # a curve of any length is mapped onto n points by linear
+        # interpolation.  With resample=False, the old truncating behavior is
+        # kept.
+        if not kwargs.get("resample", True) or vals.size == n: return vals[:n]
+        if vals.size == 0: return vals
+        if vals.size == 1: return np.full(n, vals[0])
+        return np.interp(
+            np.linspace(0.0, 1.0, n), np.linspace(0.0, 1.0, vals.size), vals
+            )
+
+    @staticmethod
+    def _check_curve(vals: np.ndarray, what: str, lo: float=None, hi: float=None):
+        bad = ~np.isfinite(vals)
+        if lo is not None: bad |= vals < lo
+        if hi is not None: bad |= vals > hi
+        idx = np.flatnonzero(bad)
+        if idx.size > 0:
+            raise ValueError(
+                "Invalid " + what + " at indices " +
+                ", ".join(str(i) for i in idx.tolist()) + "."
+                )
+
+    @staticmethod
+    def _assign_curve(curve, vals: np.ndarray, undos):
+        # Read the current values once and only cross into .NET for the points
+        # that actually change.
+        cur = pymdt.utils.details._as_float_array(curve)
+        if cur.size >= vals.size:
+            todo = np.flatnonzero(cur[:vals.size] != vals)
+        else:
+            todo = np.arange(vals.size)
+        v = vals.tolist()
+        for i in todo.tolist(): curve.set_Item(i, undos, v[i])
+
     @staticmethod
     def _extract_battery_spec_efficiency_values(bat_spec, **kwargs):
         # Don't use kwargs.get to avoid creation of the UndoPack if not needed.
@@ -14,15 +601,21 @@ class details:
         maxlen = bat_spec.NumberOfEfficiencyValues
         ceff_vals = kwargs.get("charge_efficiencies")
         if ceff_vals is not None:
-            ceffs = bat_spec.get_ChargeEfficiencies()
-            for i in range(min(len(ceff_vals), maxlen)):
-                ceffs.set_Item(i, undos, ceff_vals[i])
+            ceff_vals = pymdt.utils.details._as_float_array(ceff_vals)
+            details._check_curve(ceff_vals, "charge efficiencies", 0.0, 1.0)
+            ceff_vals = details._resample_curve(ceff_vals, maxlen, **kwargs)
+            details._assign_curve(
+                bat_spec.get_ChargeEfficiencies(), ceff_vals, undos
+                )
         
         deff_vals = kwargs.get("discharge_efficiencies")
         if deff_vals is not None:
-            deffs = bat_spec.get_DischargeEfficiencies()
-            for i in range(min(len(deff_vals), maxlen)):
-                deffs.set_Item(i, undos, deff_vals[i])
+            deff_vals = pymdt.utils.details._as_float_array(deff_vals)
+            details._check_curve(deff_vals, "discharge efficiencies", 0.0, 1.0)
+            deff_vals = details._resample_curve(deff_vals, maxlen, **kwargs)
+            details._assign_curve(
+                bat_spec.get_DischargeEfficiencies(), deff_vals, undos
+                )
                 
     @staticmethod
     def _extract_gen_spec_perf_values(gen_spec, **kwargs):
@@ -31,15 +624,10 @@ class details:
         maxlen = gen_spec.NumberOfPerformanceValues
         eff_vals = kwargs.get("efficiencies")
         if eff_vals is not None:
-            effs = gen_spec.get_EfficiencyValues()
-            for i in range(min(len(eff_vals), maxlen)):
-                effs.set_Item(i, undos, eff_vals[i])
-        
-        fuse_vals = kwargs.get("fuel_usages")
-        if fuse_vals is not None:
-            fuses = gen_spec.get_EfficiencyValues()
-            for i in range(min(len(fuse_vals), maxlen)):
-                fuses.set_Item(i, undos, fuse_vals[i])
+            eff_vals = pymdt.utils.details._as_float_array(eff_vals)
+            details._check_curve(eff_vals, "efficiencies", 0.0, 1.0)
+            eff_vals = details._resample_curve(eff_vals, maxlen, **kwargs)
+            details._assign_curve(gen_spec.get_EfficiencyValues(), eff_vals, undos)
                 
     @staticmethod
     def _extract_gen_start_probabilities(gen_spec, **kwargs):
@@ -47,9 +635,10 @@ class details:
         undos = kwargs["undos"] if "undos" in kwargs else Common.Undoing.UndoPack()
         st_probs = kwargs.get("start_probabilities")
         if st_probs is not None:
+            st_probs = pymdt.utils.details._as_float_array(st_probs)
+            details._check_curve(st_probs, "start probabilities", 0.0, 1.0)
             probs = gen_spec.get_StartProbabilities()
-            for i in range(len(st_probs)):
-                probs.Add(st_probs[i], undos)
+            for p in st_probs.tolist(): probs.Add(p, undos)
         
     @staticmethod
     def _extract_fossil_gen_spec_props(gen_spec, capacity: float, **kwargs):
@@ -355,9 +944,31 @@ class details:
     def _execute_spec_add(specType, spec, **kwargs) -> Common.Logging.Log:
         hndlrName = "Add" + specType + "SpecificationCanceled"
         specLstName = "get_" + specType + "Specifications"
-        return pymdt.utils.details._execute_1_arg_add_with_undo(
+        errLog = pymdt.utils.details._execute_1_arg_add_with_undo(
             MDT.Driver.INSTANCE, hndlrName, specLstName, spec, **kwargs
             )
+        details._invalidate_spec_index(details._resolve_spec_type(specType))
+        added = details._spec_list(specType).Contains(spec)
+        if added: details._record_spec_change(specType, spec, "added")
+        if details._spec_transactions:
+            trans = details._spec_transactions[-1]
+            if added:
+                trans.added.append((specType, spec))
+            else:
+                trans.rejected.append((specType, spec))
+        return errLog
+
+    @staticmethod
+    def _execute_spec_remove(specType, spec, **kwargs) -> bool:
+        hndlrName = "Remove" + specType + "SpecificationCanceled"
+        specLstName = "get_" + specType + "Specifications"
+        pymdt.utils.details._execute_1_arg_remove_with_undo(
+            MDT.Driver.INSTANCE, hndlrName, specLstName, spec, **kwargs
+            )
+        details._invalidate_spec_index(details._resolve_spec_type(specType))
+        removed = not details._spec_list(specType).Contains(spec)
+        if removed: details._record_spec_change(specType, spec, "deleted")
+        return removed
 
 def MakeLineSpecification(
     name: str, capacity: float, capital_cost: float, op_cost: float=0.0,
@@ -729,11 +1340,6 @@ def MakeDieselGeneratorSpecification(
             A list of 5 efficiency values, 1 each for this generator running at
             0% (idle), 25%, 50%, 75%, and 100% running rate.  The units of
             efficiency are fraction (0.0-1.0).
-        fuel_usages: [float]
-            A list of 5 fuel use values, 1 each for this generator running at
-            0% (idle), 25%, 50%, 75%, and 100% running rate.  The units of
-            efficiency during idling are gallons per hour.  The units of the
-            other rates is gallon per kW per hour.
         voltage
             A 2 element tuple or a list with 2 items in it where the first is
             the real part and the second is the imaginary.
@@ -764,6 +1370,11 @@ def MakeDieselGeneratorSpecification(
             generator as a function of it's electrical output as a fraction
             (0.0-1.0).  The fraction represents the number of kWh of heat per
             kWh of electrical energy that can be extracted.
+        resample: bool
+            Whether or not curves provided with a number of values other than
+            the number required by the specification are linearly resampled to
+            the required number.  The default is True.  If False, extra values
+            are ignored.
         sync: bool
             Whether or not to save the newly created spec to the specification
             database.  This can be done later using the
@@ -829,11 +1440,6 @@ def MakePropaneGeneratorSpecification(
             A list of 5 efficiency values, 1 each for this generator running at
             0% (idle), 25%, 50%, 75%, and 100% running rate.  The units of
             efficiency are fraction (0.0-1.0).
-        fuel_usages: [float]
-            A list of 5 fuel use values, 1 each for this generator running at
-            0% (idle), 25%, 50%, 75%, and 100% running rate.  The units of
-            efficiency during idling are gallons per hour.  The units of the
-            other rates is gallon per kW per hour.
         voltage
             A 2 element tuple or a list with 2 items in it where the first is
             the real part and the second is the imaginary.
@@ -864,6 +1470,11 @@ def MakePropaneGeneratorSpecification(
             generator as a function of it's electrical output as a fraction
             (0.0-1.0).  The fraction represents the number of kWh of heat per
             kWh of electrical energy that can be extracted.
+        resample: bool
+            Whether or not curves provided with a number of values other than
+            the number required by the specification are linearly resampled to
+            the required number.  The default is True.  If False, extra values
+            are ignored.
         sync: bool
             Whether or not to save the newly created spec to the specification
             database.  This can be done later using the
@@ -929,11 +1540,6 @@ def MakeNaturalGasGeneratorSpecification(
             A list of 5 efficiency values, 1 each for this generator running at
             0% (idle), 25%, 50%, 75%, and 100% running rate.  The units of
             efficiency are fraction (0.0-1.0).
-        fuel_usages: [float]
-            A list of 5 fuel use values, 1 each for this generator running at
-            0% (idle), 25%, 50%, 75%, and 100% running rate.  The units of
-            efficiency during idling are MMBTUs per hour.  The units of the
-            other rates is MMBTU per kW per hour.
         voltage
             A 2 element tuple or a list with 2 items in it where the first is
             the real part and the second is the imaginary.
@@ -964,6 +1570,11 @@ def MakeNaturalGasGeneratorSpecification(
             generator as a function of it's electrical output as a fraction
             (0.0-1.0).  The fraction represents the number of kWh of heat per
             kWh of electrical energy that can be extracted.
+        resample: bool
+            Whether or not curves provided with a number of values other than
+            the number required by the specification are linearly resampled to
+            the required number.  The default is True.  If False, extra values
+            are ignored.
         sync: bool
             Whether or not to save the newly created spec to the specification
             database.  This can be done later using the
@@ -1339,6 +1950,11 @@ def MakeBatterySpecification(
         desired_state_of_charge: float
             The desired state of charge of the battery in %.  The default is
             70%.
+        resample: bool
+            Whether or not curves provided with a number of values other than
+            the number required by the specification are linearly resampled to
+            the required number.  The default is True.  If False, extra values
+            are ignored.
         sync: bool
             Whether or not to save the newly created spec to the specification
             database.  This can be done later using the
@@ -1430,6 +2046,11 @@ def MakeUPSSpecification(
             is 90%.
         desired_state_of_charge: float
             The desired state of charge of the UPS in %.  The default is 70%.
+        resample: bool
+            Whether or not curves provided with a number of values other than
+            the number required by the specification are linearly resampled to
+            the required number.  The default is True.  If False, extra values
+            are ignored.
         sync: bool
             Whether or not to save the newly created spec to the specification
             database.  This can be done later using the
@@ -1464,7 +2085,9 @@ def MakeUPSSpecification(
     if(kwargs.get("sync", True)): SaveSpecificationDatabase(errLog)
     return spec
 
-def SaveSpecificationDatabase(errLog: Common.Logging.Log=None) -> Common.Logging.Log:
+def SaveSpecificationDatabase(
+    errLog: Common.Logging.Log=None, skip_if_clean: bool=False
+    ) -> Common.Logging.Log:
     """ A helper function to store any new, deleted, or changed specifications
     to the underlying database.
         
@@ -1477,6 +2100,11 @@ def SaveSpecificationDatabase(errLog: Common.Logging.Log=None) -> Common.Logging
         A log that will receive any messages produced while saving the database
         changes and additions. If this parameter is None, then the
         pymdt.GlobalErrorLog will be used.
+    skip_if_clean: bool
+        If True, the sync is skipped when PendingSpecChanges reports nothing
+        to save.  Only changes made through pymdt are tracked so use this only
+        if any specs modified directly have been marked using
+        MarkSpecModified.  The default is False (always sync).
         
     Returns
     -------
@@ -1484,7 +2112,613 @@ def SaveSpecificationDatabase(errLog: Common.Logging.Log=None) -> Common.Logging
         A log containing any errors or messages creating during the
         synchronization operation.  If the errLog parameter is None, then the
         pymdt.GlobalErrorLog will be used and returned.
+
+    Notes
+    -----
+    Within a bulk_specs block, the sync is deferred until the end of the
+    outermost block.
+
+    The MDT synchronizes the whole database at once so the cost of a sync
+    grows with the size of the catalog rather than the number of changes.  The
+    time taken by each sync is recorded and available from SpecSyncHistory.
+    """
+    errLog = errLog or pymdt.GlobalErrorLog
+    if details._spec_transactions:
+        details._spec_transactions[0].sync_requested = True
+        return errLog
+    if skip_if_clean and not details._pending_spec_changes: return errLog
+
+    pending = len(details._pending_spec_changes)
+    start = time.perf_counter()
+    MDT.Driver.INSTANCE.SynchronizeSpecificationsDB(errLog)
+    elapsed = time.perf_counter() - start
+
+    details._spec_sync_history.append({
+        "time": time.time(), "elapsed": elapsed, "pending": pending,
+        "catalog_size": details._catalog_size()
+        })
+    details._pending_spec_changes.clear()
+    details._invalidate_spec_index()
+    return errLog
+
+def PendingSpecChanges() -> dict:
+    """ Reports the specifications added, modified, or deleted through pymdt
+    since the database was last synchronized.
+
+    Additions and deletions made through the Make*Specification functions,
+    ImportCatalog, and DeleteSpecification are tracked automatically.  Changes
+    made by setting properties of existing specs directly are only tracked if
+    they are reported using MarkSpecModified.
+
+    Returns
+    -------
+    dict:
+        A dictionary with the keys "added", "modified", and "deleted" each
+        mapped to a list of the specifications in that state.
+    """
+    ret = {"added": [], "modified": [], "deleted": []}
+    for specType, spec, state in details._pending_spec_changes.values():
+        ret[state].append(spec)
+    return ret
+
+def MarkSpecModified(spec, kind=None):
+    """ Records that the properties of an existing specification were changed
+    so that it is reported by PendingSpecChanges and by an open bulk_specs
+    transaction.
+
+    Parameters
+    ----------
+    spec
+        The specification that was modified.
+    kind: spec_types
+        The type of the specification.  If not provided, it is determined from
+        the type of spec.
+    """
+    kind = details._spec_type_of(spec) if kind is None else \
+        details._resolve_spec_type(kind)
+    details._note_spec_changed(kind.value, spec)
+    details._invalidate_spec_index(kind)
+
+def DeleteSpecification(spec, kind=None, **kwargs) -> bool:
+    """ Removes a specification from the master list of its type.
+
+    Parameters
+    ----------
+    spec
+        The specification to remove.
+    kind: spec_types
+        The type of the specification.  If not provided, it is determined from
+        the type of spec.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        sync: bool
+            Whether or not to save the change to the specification database.
+            The default is to save the change (True).
+        err_log: Common.Logging.Log
+            The log into which to record any messages generated while removing
+            the specification or saving the change.  If this argument is not
+            provided, messages will be recorded into the pymdt.GlobalErrorLog
+            instance.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated during this operation (if any).
+
+    Returns
+    -------
+    bool:
+        True if the specification was found and removed and False otherwise.
+    """
+    kind = details._spec_type_of(spec) if kind is None else \
+        details._resolve_spec_type(kind)
+    if not details._spec_list(kind.value).Contains(spec): return False
+    passed = {k: kwargs[k] for k in ("err_log", "undos") if k in kwargs}
+    if not details._execute_spec_remove(kind.value, spec, **passed):
+        return False
+    if kwargs.get("sync", True): SaveSpecificationDatabase(kwargs.get("err_log"))
+    return True
+
+def SpecSyncHistory() -> list:
+    """ Returns the timing of the most recent specification database syncs.
+
+    Returns
+    -------
+    list:
+        A list of dictionaries, oldest first, with the keys "time" (the
+        time.time() at which the sync completed), "elapsed" (seconds spent
+        syncing), "pending" (the number of tracked changes that were saved),
+        and "catalog_size" (the total number of specifications of all types).
+    """
+    return list(details._spec_sync_history)
+
+@contextlib.contextmanager
+def bulk_specs(**kwargs):
+    """ A context manager that groups the creation of many specifications into
+    a single transaction.
+
+    Within the block, calls to SaveSpecificationDatabase (including those made
+    by the Make*Specification functions) are deferred and a single sync is
+    performed when the outermost block exits.  If the block raises an
+    exception, the specifications added within it are removed from the master
+    lists again, no sync is performed, and the exception is propagated.  Only
+    additions are rolled back.  Changes made to existing specifications within
+    the block (including those reported using MarkSpecModified) are kept and
+    remain pending until the next sync.  Blocks may be nested in which case an
+    inner block that raises rolls back only its own additions.
+
+    .. code-block:: python
+
+        with bulk_specs() as t:
+            for row in rows:
+                MakeBatterySpecification(row["name"], row["cost"])
+        print(t)
+
+    Parameters
+    ----------
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        sync: bool
+            Whether or not to synchronize the specification database when the
+            outermost block exits successfully.  The default is True.
+        err_log: Common.Logging.Log
+            The log into which to record any messages generated by the final
+            sync or by a rollback.  If this argument is not provided, messages
+            will be recorded into the pymdt.GlobalErrorLog instance.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated by a rollback (if any).
+
+    Returns
+    -------
+    spec_transaction:
+        The record of the specifications added, changed, or rejected within
+        the block.  It is filled in as the block executes and finalized when it
+        exits.
+    """
+    trans = spec_transaction()
+    outer = not details._spec_transactions
+    details._spec_transactions.append(trans)
+    start = time.perf_counter()
+    try:
+        yield trans
+    except BaseException:
+        details._spec_transactions.pop()
+        details._rollback_spec_transaction(trans, **kwargs)
+        trans.elapsed = time.perf_counter() - start
+        raise
+
+    details._spec_transactions.pop()
+    if outer:
+        if kwargs.get("sync", True) and (
+            trans.sync_requested or trans.added or trans.changed
+            ):
+            SaveSpecificationDatabase(kwargs.get("err_log"))
+            trans.synced = True
+    else:
+        parent = details._spec_transactions[-1]
+        parent.added.extend(trans.added)
+        parent.changed.extend(trans.changed)
+        parent.rejected.extend(trans.rejected)
+    trans.elapsed = time.perf_counter() - start
+
+
+def ImportCatalog(path_or_rows, kind, **kwargs) -> spec_transaction:
+    """ Creates specifications of a single type from the rows of a table.
+
+    Each row becomes one call to the Make*Specification function for the
+    requested type.  The column names are the names of the arguments of that
+    function (name, capacity, capital_cost, op_cost, weight, volume, notes,
+    etc.).  The voltage and impedance are given by the real/imaginary and
+    resistance/reactance columns respectively.  Array valued columns such as
+    efficiencies, start_probabilities, charge_efficiencies, and
+    discharge_efficiencies hold their items separated by semicolons.  Empty
+    cells take the default of the corresponding argument.  Unrecognized columns
+    are ignored with a warning.
+
+    The whole table is loaded within a single bulk_specs transaction so that
+    the specification database is synchronized only once, and if any row
+    fails, all the specifications added from the table are removed again.
+
+    Parameters
+    ----------
+    path_or_rows
+        Either the path of a CSV file with a header row or an iterable of
+        dictionaries mapping column names to values.
+    kind: spec_types
+        The type of specifications in the table.  This may be a member of the
+        spec_types enumeration, the name of one, or its value.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        sync: bool
+            Whether or not to synchronize the specification database once all
+            rows have been loaded.  The default is True.
+        err_log: Common.Logging.Log
+            The log into which to record any errors encountered during the
+            import.  If this argument is not provided, messages will be
+            recorded into the pymdt.GlobalErrorLog instance.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated during this operation (if any).
+
+    Returns
+    -------
+    spec_transaction:
+        The record of the specifications added and rejected and the time taken
+        including the final sync.
+    """
+    kind = details._resolve_spec_type(kind)
+    errLog = kwargs.get("err_log", pymdt.GlobalErrorLog)
+    make = details._catalog_makers[kind]
+    passed = {k: kwargs[k] for k in ("err_log", "undos") if k in kwargs}
+
+    with bulk_specs(**kwargs) as trans:
+        for row in details._read_catalog_rows(path_or_rows):
+            args = details._catalog_row_to_kwargs(kind, row, errLog)
+            make(sync=False, **passed, **args)
+    return trans
+
+def ExportCatalog(kind, path: str) -> int:
+    """ Writes all specifications of a single type to a CSV file in the form
+    read by ImportCatalog.
+
+    Parameters
+    ----------
+    kind: spec_types
+        The type of specifications to write.  This may be a member of the
+        spec_types enumeration, the name of one, or its value.
+    path: str
+        The path of the CSV file to write.
+
+    Returns
+    -------
+    int:
+        The number of specifications written.
+    """
+    kind = details._resolve_spec_type(kind)
+    cols = [c for c in details._catalog_columns[kind] if c[2] is not None]
+    count = 0
+    with open(path, "w", newline="") as fp:
+        w = csv.writer(fp)
+        w.writerow([c[0] for c in cols])
+        for spec in details._spec_list(kind.value):
+            w.writerow(
+                [details._format_catalog_value(c[1], c[2](spec)) for c in cols]
+                )
+            count += 1
+    return count
+
+def QuerySpecs(kind, **kwargs) -> list:
+    """ Finds the specifications of the supplied type whose numeric properties
+    satisfy all of the supplied criteria.
+
+    Queries are answered from a columnar snapshot of the master list of the
+    requested type that is built on first use and kept until the list may have
+    changed (a spec is added or SaveSpecificationDatabase is called).  For
+    example, the following finds the three battery specs with between 200 and
+    500 kWh of capacity costing less than $300,000 that have the lowest cost
+    per kWh:
+
+    .. code-block:: python
+
+        QuerySpecs(
+            spec_types.battery, capacity=(200, 500), capital_cost=(None, 3e5),
+            sort_by="cost_per_capacity", top_k=3
+            )
+
+    Parameters
+    ----------
+    kind: spec_types
+        The type of specifications to search.  This may be a member of the
+        spec_types enumeration, the name of one, or its value.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        <column>: tuple[float,float]
+            The inclusive (lower, upper) range into which the named column must
+            fall.  The columns are capacity (energy capacity for batteries and
+            UPSs), capital_cost, op_cost, weight, volume, and
+            cost_per_capacity.  Either bound may be None in which case that
+            side of the range is open.
+        sort_by: str
+            The name of a column by which to sort the results.  The default is
+            to keep the order of the master list.
+        descending: bool
+            Whether to sort in descending order.  The default is False.
+        top_k: int
+            The maximum number of specifications to return.  The default is to
+            return all matches.
+
+    Returns
+    -------
+    list:
+        The matching specifications.
+    """
+    idx = details._get_spec_index(details._resolve_spec_type(kind))
+    mask = np.ones(len(idx["specs"]), dtype=bool)
+
+    reserved = ("sort_by", "descending", "top_k")
+    for key, rng in kwargs.items():
+        if key in reserved: continue
+        if key not in idx or key == "specs":
+            raise KeyError("Unknown specification column " + key)
+        lo, hi = rng
+        if lo is not None: mask &= idx[key] >= lo
+        if hi is not None: mask &= idx[key] <= hi
+
+    sel = np.flatnonzero(mask)
+    sort_by = kwargs.get("sort_by")
+    if sort_by is not None:
+        if sort_by not in idx or sort_by == "specs":
+            raise KeyError("Unknown specification column " + sort_by)
+        vals = idx[sort_by][sel]
+        if kwargs.get("descending", False): vals = -vals
+        sel = sel[np.argsort(vals, kind="stable")]
+
+    top_k = kwargs.get("top_k")
+    if top_k is not None: sel = sel[:top_k]
+    specs = idx["specs"]
+    return [specs[i] for i in sel.tolist()]
+
+def PruneDominated(specs, criteria: dict = None) -> list:
+    """ Removes the specifications that are dominated by another in the supplied
+    collection.
+
+    A specification is dominated if another is at least as good in every
+    criterion and strictly better in at least one.  Offering dominated
+    specifications to an asset only enlarges the search space of the solver
+    since they can never be part of a best solution with respect to the
+    criteria.  Specifications that tie in every criterion are all kept.
+
+    This can be applied automatically to the specs argument of the Make
+    functions of pymdt.core by providing their prune_dominated argument.  That
+    argument is either True, to prune using the default criteria, or a
+    criteria dictionary as accepted here.  If it is not provided, the specs are
+    assigned without pruning.
+
+    Parameters
+    ----------
+    specs: iterable
+        The specifications to filter.  They must all be of one type unless
+        criteria are supplied.
+    criteria: dict
+        A dictionary mapping each criterion to "min" or "max" to indicate
+        whether smaller or larger values are better.  A criterion may be one of
+        capacity (energy capacity for batteries and UPSs), capital_cost,
+        op_cost, weight, volume, max_charge_rate, or max_discharge_rate, one of
+        the performance curves efficiencies, charge_efficiencies, or
+        discharge_efficiencies, the name of any other numeric property of the
+        specifications, or a callable that accepts a specification and returns
+        a number.  Curves are compared at evenly spaced fractions of load so a
+        specification whose curve is better at some loads and worse at others
+        is not dominated.  The default is to minimize capital_cost, op_cost,
+        weight, and volume for all types, to maximize capacity for all types
+        but switches and inverters (which have none), to maximize efficiencies
+        for fossil generators, and to maximize the charge and discharge
+        efficiencies and rates for batteries and UPSs.  A ValueError is raised
+        if a criterion is not defined for every one of the specifications.
+
+    Returns
+    -------
+    list:
+        The non-dominated specifications in their original order.
+    """
+    if not pymdt.utils.details._is_collection(specs): specs = [specs]
+    specs = list(specs)
+    if len(specs) < 2: return specs
+    if criteria is None: criteria = details._default_prune_criteria(specs)
+    m = details._criteria_matrix(specs, criteria)
+    keep = details._pareto_mask(m)
+    return [sp for sp, k in zip(specs, keep.tolist()) if k]
+
+def Snapshot(path: str=None) -> spec_snapshot:
+    """ Captures which specifications are in each master list so that the lists
+    can later be put back the way they are now using Restore.
+
+    The in-memory form holds references to the specifications themselves and
+    is very cheap to take.  If a path is provided, the specifications are also
+    written, one CSV file per type as by ExportCatalog along with a manifest,
+    so that the snapshot can be restored in another session.
+
+    Parameters
+    ----------
+    path: str
+        An optional directory into which to write the snapshot.  It is created
+        if it does not exist.
+
+    Returns
+    -------
+    spec_snapshot:
+        The snapshot to provide to Restore.
+    """
+    snap = spec_snapshot()
+    for st in spec_types:
+        snap.members[st] = {
+            sp.GUID.ToString(): sp for sp in details._spec_list(st.value)
+            }
+
+    if path is not None:
+        os.makedirs(path, exist_ok=True)
+        for st in spec_types:
+            ExportCatalog(st, os.path.join(path, st.value + ".csv"))
+        man = {
+            "version": details.SNAPSHOT_VERSION,
+            "types": {st.value: list(m.keys()) for st, m in snap.members.items()}
+            }
+        with open(os.path.join(path, details.SNAPSHOT_MANIFEST_FILE), "w") as fp:
+            json.dump(man, fp)
+        snap.path = path
+    return snap
+
+def Restore(snapshot, **kwargs) -> dict:
+    """ Puts the specification master lists back the way they were when the
+    supplied snapshot was taken.
+
+    Specifications added since the snapshot are removed and those removed
+    since the snapshot are put back.  Only membership is restored.  Changes
+    made to the properties of specifications present both now and in the
+    snapshot are not undone.
+
+    Parameters
+    ----------
+    snapshot
+        Either a spec_snapshot returned by Snapshot or the path of a directory
+        into which one was written.  When given a path, removed specifications
+        are re-created from the files with their original GUIDs.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        sync: bool
+            Whether or not to synchronize the specification database if
+            anything was changed.  The default is True.
+        err_log: Common.Logging.Log
+            The log into which to record any errors encountered.  If this
+            argument is not provided, messages will be recorded into the
+            pymdt.GlobalErrorLog instance.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated during this operation (if any).
+
+    Returns
+    -------
+    dict:
+        A dictionary with the number of specifications "removed" and
+        "restored".  Specifications whose re-addition was canceled by the MDT
+        are not counted as restored.
+    """
+    if type(snapshot) is str:
+        path = snapshot
+        wanted = {
+            details._resolve_spec_type(k): set(v) for k, v in
+            details._read_snapshot_manifest(path)["types"].items()
+            }
+        objs = {}
+    else:
+        path = None
+        wanted = {st: set(m.keys()) for st, m in snapshot.members.items()}
+        objs = snapshot.members
+
+    passed = {k: kwargs[k] for k in ("err_log", "undos") if k in kwargs}
+    removed = 0
+    restored = 0
+    for st, guids in wanted.items():
+        current = {
+            sp.GUID.ToString(): sp for sp in details._spec_list(st.value)
+            }
+        for guid, sp in current.items():
+            if guid not in guids and \
+                DeleteSpecification(sp, st, sync=False, **passed):
+                removed += 1
+
+        missing = guids.difference(current.keys())
+        if not missing: continue
+        if path is None:
+            lst = details._spec_list(st.value)
+            for guid in missing:
+                spec = objs[st][guid]
+                details._execute_spec_add(st.value, spec, **passed)
+                if lst.Contains(spec): restored += 1
+        else:
+            rows = [
+                r for r in details._read_catalog_rows(
+                    os.path.join(path, st.value + ".csv")
+                    ) if r.get("guid") in missing
+                ]
+            trans = ImportCatalog(rows, st, sync=False, **passed)
+            restored += len(trans.added)
+
+    if kwargs.get("sync", True) and (removed or restored):
+        SaveSpecificationDatabase(kwargs.get("err_log"))
+    return {"removed": removed, "restored": restored}
+
+@contextlib.contextmanager
+def isolated_specs(**kwargs):
+    """ A context manager within which specifications can be freely added and
+    removed without affecting the specification database.
+
+    A snapshot is taken on entry and restored on exit whether or not the block
+    raises.  Syncs requested within the block are discarded so the additions
+    and removals made in the block never reach the database.  Only the
+    membership of the master lists is restored.  Changes made within the
+    block to the properties of specifications that existed before it are kept
+    and, if reported using MarkSpecModified, remain pending so they are saved
+    by the next sync.
+
+    To give concurrently running processes each their own database instead,
+    copy it with CopySpecificationDatabase and provide the copy as the
+    MDT_SPEC_DB_DIR argument of each process.
+
+    Parameters
+    ----------
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        err_log: Common.Logging.Log
+            The log into which to record any errors encountered while
+            restoring.  If this argument is not provided, messages will be
+            recorded into the pymdt.GlobalErrorLog instance.
+
+    Returns
+    -------
+    spec_snapshot:
+        The snapshot taken on entry.
+    """
+    snap = Snapshot()
+    pending = {k: list(v) for k, v in details._pending_spec_changes.items()}
+    trans = spec_transaction()
+    details._spec_transactions.append(trans)
+    try:
+        yield snap
+    finally:
+        details._spec_transactions.remove(trans)
+        Restore(snap, **{**kwargs, "sync": False})
+        # The lists are back as they were so whatever was pending on entry is
+        # pending now along with the modifications of the specs that existed
+        # on entry since those are not undone.
+        for key, ent in details._pending_spec_changes.items():
+            if ent[2] == "modified" and key[1] in \
+                snap.members[details._resolve_spec_type(key[0])]:
+                pending.setdefault(key, ent)
+        details._pending_spec_changes.clear()
+        details._pending_spec_changes.update(pending)
+
+def CopySpecificationDatabase(dest_dir: str, source_dir: str=None) -> str:
+    """ Copies the specification database directory so that it can be used as
+    a private database.
+
+    The MDT opens its specification database once when pymdt is imported so a
+    copy cannot be swapped in within a running session.  Instead, provide the
+    returned directory as the MDT_SPEC_DB_DIR argument of a new process (see
+    the pymdt package documentation).
+
+    Parameters
+    ----------
+    dest_dir: str
+        The directory to create as the copy.  It must not already exist.
+    source_dir: str
+        The database directory to copy.  The default is the pymdt.MDT_SPEC_DB_DIR
+        if one was provided.  If not, the MDT used its own default location
+        which pymdt cannot determine so this argument is required and a
+        ValueError is raised if it is not provided.
+
+    Returns
+    -------
+    str:
+        The dest_dir.
     """
-    MDT.Driver.INSTANCE.SynchronizeSpecificationsDB(
-        errLog or pymdt.GlobalErrorLog
-        )
\ No newline at end of file
+    if source_dir is None:
+        source_dir = pymdt.MDT_SPEC_DB_DIR
+        if source_dir is None:
+            raise ValueError(
+                "The source_dir must be provided to CopySpecificationDatabase "
+                "when no MDT_SPEC_DB_DIR was given to pymdt."
+                )
+    shutil.copytree(source_dir, dest_dir)
+    return dest_dir
@@ -0,0 +1,486 @@
+import os
+import zlib
+import struct
+
+import numpy as np
+
+from enum import Enum
+
+import MDT
+import Common
+
+import pymdt
+import pymdt.utils
+import pymdt.core
+
+class compact_encodings(Enum):
+    """ An enumeration of the value encodings available for compact profile
+    storage.  In all cases, spans of exact zeros are run-length encoded and
+    only the non-zero values are stored using the selected encoding.
+    """
+
+    float64 = 0
+    """ Non-zero values are stored as full double precision values.  This
+    encoding is lossless.
+    """
+
+    float32 = 1
+    """ Non-zero values are stored as single precision values.  The relative
+    error of each value is at most about 6e-8.
+    """
+
+    quantized = 2
+    """ Non-zero values are rounded to a multiple of twice the supplied
+    tolerance and stored as the differences between consecutive multiples
+    using the smallest integer type that can hold them.  The absolute error of
+    each value is at most the tolerance.
+    """
+
+class details:
+
+    COMPACT_MAGIC = b"PYMDTCP1"
+    COMPACT_EXTENSION = ".mcp"
+
+    # magic, encoding, integer type code, count, quantization step, # of runs.
+    _compact_header = struct.Struct("<8sBBQdI")
+
+    _int_types = (np.int8, np.int16, np.int32, np.int64)
+
+    @staticmethod
+    def _compact_file_name(file_name: str) -> str:
+        if os.path.splitext(file_name)[1]: return file_name
+        return file_name + details.COMPACT_EXTENSION
+
+    @staticmethod
+    def _extract_values(data) -> np.ndarray:
+        # Accept anything iterable as well as the MDT objects that carry
+        # profile data.
+        if isinstance(data, MDT.StoredTierLoadConfiguration):
+            data = data.LoadData
+        elif hasattr(data, "LoadDataList"):
+            data = data.LoadDataList
+        return pymdt.utils.details._as_float_array(data)
+
+    @staticmethod
+    def _per_variant(value, count: int, name: str) -> np.ndarray:
+        # Returns a column so that per-variant values broadcast across the
+        # time axis of a (count, n) batch.
+        v = np.asarray(value, dtype=np.float64)
+        if v.ndim == 0: return np.full((count, 1), float(v))
+        if v.shape == (count,): return v.reshape(count, 1)
+        raise ValueError(
+            "The " + name + " argument must be a scalar or have one value per "
+            "variant (" + str(count) + ") but has shape " + str(v.shape) + "."
+            )
+
+    @staticmethod
+    def _apply_shape(out: np.ndarray, amplitude, t: np.ndarray, cycle: float, peak: float, name: str):
+        if amplitude is None: return
+        a = details._per_variant(amplitude, out.shape[0], name)
+        out *= 1.0 + a * np.cos(2.0 * np.pi * (t - peak) / cycle)
+
+    @staticmethod
+    def _apply_outages(out: np.ndarray, rng, **kwargs):
+        count, n = out.shape
+        fill = kwargs.get("outage_value", 0.0)
+
+        mask = kwargs.get("outage_mask")
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != (n,) and mask.shape != (count, n):
+                raise ValueError(
+                    "The outage_mask argument must have shape " + str((n,)) +
+                    " or " + str((count, n)) + " but has shape " +
+                    str(mask.shape) + "."
+                    )
+            out[np.broadcast_to(mask, out.shape)] = fill
+
+        k = int(kwargs.get("outage_count", 0))
+        if k <= 0 or n == 0: return
+        dur = max(int(kwargs.get("outage_duration", 1)), 1)
+        starts = rng.integers(0, n, size=(count, k))
+        idx = np.minimum(starts[..., None] + np.arange(dur), n - 1)
+        out[np.arange(count)[:, None, None], idx] = fill
+
+    @staticmethod
+    def _zero_runs(is_zero: np.ndarray) -> np.ndarray:
+        # Run lengths alternate between non-zero and zero spans starting with
+        # a (possibly empty) non-zero span.
+        n = is_zero.size
+        if n == 0: return np.zeros(0, dtype=np.uint32)
+        bounds = np.flatnonzero(is_zero[1:] != is_zero[:-1]) + 1
+        runs = np.diff(np.concatenate(([0], bounds, [n])))
+        if is_zero[0]: runs = np.concatenate(([0], runs))
+        return runs.astype(np.uint32)
+
+    @staticmethod
+    def _zero_mask(runs: np.ndarray, n: int) -> np.ndarray:
+        mask = np.repeat(np.arange(runs.size) % 2 == 1, runs)
+        if mask.size != n:
+            raise ValueError(
+                "Corrupt compact profile.  The zero runs cover " +
+                str(mask.size) + " of " + str(n) + " values."
+                )
+        return mask
+
+    @staticmethod
+    def _encode_compact(values: np.ndarray, encoding, tolerance: float, level: int) -> bytes:
+        if type(encoding) is str: encoding = compact_encodings[encoding]
+        is_zero = values == 0.0
+        runs = details._zero_runs(is_zero)
+        nz = values[~is_zero]
+        step = 0.0
+        int_code = 0
+
+        if encoding == compact_encodings.float64:
+            payload = nz.astype("<f8").tobytes()
+        elif encoding == compact_encodings.float32:
+            payload = nz.astype("<f4").tobytes()
+        else:
+            if tolerance is None or tolerance <= 0.0:
+                raise ValueError(
+                    "A positive tolerance is required for quantized encoding."
+                    )
+            step = 2.0 * tolerance
+            q = np.rint(nz / step).astype(np.int64)
+            deltas = np.diff(q, prepend=np.int64(0))
+            lo = int(deltas.min()) if deltas.size > 0 else 0
+            hi = int(deltas.max()) if deltas.size > 0 else 0
+            for int_code, it in enumerate(details._int_types):
+                info = np.iinfo(it)
+                if info.min <= lo and hi <= info.max: break
+            dt = np.dtype(details._int_types[int_code]).newbyteorder("<")
+            payload = deltas.astype(dt).tobytes()
+
+        header = details._compact_header.pack(
+            details.COMPACT_MAGIC, encoding.value, int_code, values.size, step,
+            runs.size
+            )
+        return header + zlib.compress(
+            runs.astype("<u4").tobytes() + payload, level
+            )
+
+    @staticmethod
+    def _decode_compact(buf, out: np.ndarray=None) -> np.ndarray:
+        hsz = details._compact_header.size
+        magic, enc, int_code, n, step, nruns = \
+            details._compact_header.unpack_from(buf, 0)
+        if magic != details.COMPACT_MAGIC:
+            raise ValueError("The supplied data is not a compact profile.")
+
+        raw = zlib.decompress(memoryview(buf)[hsz:])
+        runs = np.frombuffer(raw, dtype="<u4", count=nruns)
+        mask = details._zero_mask(runs, n)
+        offset = 4 * nruns
+
+        encoding = compact_encodings(enc)
+        if encoding == compact_encodings.float64:
+            nz = np.frombuffer(raw, dtype="<f8", offset=offset)
+        elif encoding == compact_encodings.float32:
+            nz = np.frombuffer(raw, dtype="<f4", offset=offset)
+        else:
+            dt = np.dtype(details._int_types[int_code]).newbyteorder("<")
+            nz = np.cumsum(
+                np.frombuffer(raw, dtype=dt, offset=offset), dtype=np.int64
+                ) * step
+
+        if out is None:
+            out = np.zeros(n, dtype=np.float64)
+        else:
+            if out.shape != (n,):
+                raise ValueError(
+                    "The supplied output buffer has shape " + str(out.shape) +
+                    " but the compact profile holds " + str(n) + " values."
+                    )
+            out[mask] = 0.0
+        out[~mask] = nz
+        return out
+
+def EncodeCompactProfile(data, **kwargs) -> bytes:
+    """ Encodes the supplied profile data into the compact profile format.
+
+    Spans of exact zeros (such as the night hours of a solar resource profile)
+    are run-length encoded and the remaining values are stored using the
+    requested encoding.  The result is then compressed.  Use
+    DecodeCompactProfile to get the values back as a numpy array.
+
+    Parameters
+    ----------
+    data
+        The profile data to encode.  This can be a numpy array, any iterable of
+        values convertible to float, an MDT.StoredTierLoadConfiguration (whose
+        LoadData is used), or an MDT.IRegularPeriodData (whose LoadDataList is
+        used).
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        encoding: compact_encodings
+            A member of the compact_encodings enumeration (or the name of one)
+            indicating how non-zero values are to be stored.  The default is
+            float32 unless a tolerance is supplied in which case it is
+            quantized.
+        tolerance: float
+            The maximum absolute error allowed for any value when using the
+            quantized encoding.
+        compression_level: int
+            The zlib compression level to use (0-9).  The default is 6.
+
+    Returns
+    -------
+    bytes:
+        The encoded profile.
+    """
+    tol = kwargs.get("tolerance")
+    enc = kwargs.get(
+        "encoding", compact_encodings.float32 if tol is None else \
+            compact_encodings.quantized
+        )
+    return details._encode_compact(
+        details._extract_values(data), enc, tol,
+        kwargs.get("compression_level", 6)
+        )
+
+def DecodeCompactProfile(buf, out: np.ndarray=None) -> np.ndarray:
+    """ Decodes a profile encoded by EncodeCompactProfile.
+
+    Parameters
+    ----------
+    buf
+        The encoded profile as bytes or any other object supporting the buffer
+        protocol.
+    out: numpy.ndarray
+        An optional 1-D float64 array into which to decode the values.  It must
+        have exactly as many elements as the encoded profile.  If not provided,
+        a new array is created.
+
+    Returns
+    -------
+    numpy.ndarray:
+        The decoded profile values as float64.
+    """
+    return details._decode_compact(buf, out)
+
+def WriteCompactProfile(file_name: str, data, **kwargs) -> int:
+    """ Encodes the supplied profile data into the compact profile format and
+    writes it to a file.
+
+    The compact format is a pymdt format and is not read by the MDT itself.  It
+    is intended for keeping large libraries of profiles small on disk and fast
+    to load.  The values read back using ReadCompactProfile can be supplied
+    directly as the data argument of functions like MakeLoadDataTier and
+    MakeSolarResource or to ResetRegularPeriodData.
+
+    Parameters
+    ----------
+    file_name: str
+        The name of the file to write.  If it has no extension, the ".mcp"
+        compact profile extension is appended.
+    data
+        The profile data to encode.  See EncodeCompactProfile for the accepted
+        types.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        See EncodeCompactProfile for the arguments used.
+
+    Returns
+    -------
+    int:
+        The number of bytes written.
+    """
+    buf = EncodeCompactProfile(data, **kwargs)
+    with open(details._compact_file_name(file_name), "wb") as fp:
+        fp.write(buf)
+    return len(buf)
+
+def ReadCompactProfile(file_name: str, out: np.ndarray=None) -> np.ndarray:
+    """ Reads a file written by WriteCompactProfile and returns its values.
+
+    Parameters
+    ----------
+    file_name: str
+        The name of the compact profile file to read.  If it has no
+        extension, the ".mcp" compact profile extension is appended.
+    out: numpy.ndarray
+        An optional 1-D float64 array into which to decode the values.  See
+        DecodeCompactProfile.
+
+    Returns
+    -------
+    numpy.ndarray:
+        The decoded profile values as float64.
+    """
+    with open(details._compact_file_name(file_name), "rb") as fp:
+        buf = fp.read()
+    return details._decode_compact(buf, out)
+
+def Synthesize(base, count: int, **kwargs) -> np.ndarray:
+    """ Generates a batch of variants of a base profile in a single vectorized
+    pass.
+
+    Each row of the result is one variant.  The operations are applied in the
+    order: scale, growth, diurnal shaping, seasonal shaping, noise, clipping
+    and finally outages.
+
+    Parameters
+    ----------
+    base
+        The base profile from which to generate variants.  See
+        EncodeCompactProfile for the accepted types.
+    count: int
+        The number of variants to generate.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        Arguments described as "per variant" may be a scalar used for all
+        variants or a sequence with one value per variant.  The arguments used
+        by this method include:
+
+        period_hours: float
+            The period of the profile, which is the number of hours between
+            consecutive values.  This is used for the growth and shaping terms.
+            The default is 1.
+        scale: float or iterable
+            A per variant multiplier of the base profile.  The default is 1.
+        growth: float or iterable
+            A per variant annual fractional growth rate applied continuously
+            over the profile such that the last value of a one year profile is
+            scaled by (1 + growth).  The default is no growth.
+        diurnal_amplitude: float or iterable
+            The per variant relative amplitude of a daily cosine shape applied
+            as a multiplier of (1 + amplitude*cos(...)).  The default is no
+            diurnal shaping.
+        diurnal_peak_hour: float
+            The hour of the day at which the diurnal shape peaks.  The default
+            is 18.
+        seasonal_amplitude: float or iterable
+            The per variant relative amplitude of a yearly cosine shape applied
+            as a multiplier in the same way as the diurnal shape.  The default
+            is no seasonal shaping.
+        seasonal_peak_day: float
+            The day of the year at which the seasonal shape peaks.  The default
+            is 200.
+        noise: float or iterable
+            The per variant standard deviation of multiplicative Gaussian noise
+            such that each value is multiplied by (1 + noise*N(0, 1)).  The
+            default is no noise.
+        seed: int
+            The seed for the random number generator used for noise and
+            outages.  Provide this to get repeatable batches.
+        clip: tuple
+            A (low, high) pair bounding all values.  Either may be None to
+            leave that side unbounded.  The default is (0, None) which keeps
+            values non-negative.  Use (0, 1) for normalized solar resources.
+        outage_mask: iterable
+            A boolean mask of the same length as the profile, or of shape
+            (count, length), indicating values to be replaced by the
+            outage_value.
+        outage_count: int
+            The number of randomly placed outages to impose on each variant.
+            The default is 0.
+        outage_duration: int
+            The number of consecutive values covered by each random outage.
+            The default is 1.
+        outage_value: float
+            The value to use during outages.  The default is 0.
+
+    Returns
+    -------
+    numpy.ndarray:
+        A float64 array of shape (count, len(base)).
+    """
+    base = details._extract_values(base)
+    count = int(count)
+    n = base.size
+    rng = np.random.default_rng(kwargs.get("seed"))
+    t = np.arange(n, dtype=np.float64) * float(kwargs.get("period_hours", 1.0))
+
+    out = np.empty((count, n), dtype=np.float64)
+    out[:] = base
+
+    if "scale" in kwargs:
+        out *= details._per_variant(kwargs["scale"], count, "scale")
+
+    if "growth" in kwargs:
+        g = details._per_variant(kwargs["growth"], count, "growth")
+        out *= np.power(1.0 + g, t / 8760.0)
+
+    details._apply_shape(
+        out, kwargs.get("diurnal_amplitude"), t, 24.0,
+        float(kwargs.get("diurnal_peak_hour", 18.0)), "diurnal_amplitude"
+        )
+    details._apply_shape(
+        out, kwargs.get("seasonal_amplitude"), t, 8760.0,
+        24.0 * float(kwargs.get("seasonal_peak_day", 200.0)),
+        "seasonal_amplitude"
+        )
+
+    if kwargs.get("noise") is not None:
+        sd = details._per_variant(kwargs["noise"], count, "noise")
+        z = rng.standard_normal((count, n))
+        z *= sd
+        z += 1.0
+        out *= z
+
+    lo, hi = kwargs.get("clip", (0.0, None))
+    if lo is not None or hi is not None: np.clip(out, lo, hi, out=out)
+
+    details._apply_outages(out, rng, **kwargs)
+    return out
+
+def AssignProfiles(targets, profiles, **kwargs):
+    """ Assigns each row of a batch of profiles to the corresponding regular
+    period data instance.
+
+    This is typically used with the result of Synthesize to push a whole sweep
+    of variants into the model at once.  All profiles are validated as by
+    ResetRegularPeriodData before any is assigned so that if one is rejected,
+    none of the targets are changed.  All assignments share a single undo pack
+    and error log.
+
+    Parameters
+    ----------
+    targets: iterable
+        The MDT.IRegularPeriodData instances (load data tiers, solar
+        resources, etc.) to receive the profiles.
+    profiles
+        Either a 2-D array-like with one row per target or a single 1-D
+        profile to be assigned to every target.
+    kwargs: dict
+        A dictionary of all the variable arguments provided to this function.
+        The arguments used by this method include:
+
+        err_log: Common.Logging.Log
+            A Log object into which to capture any messages generated during
+            this operation.  If not provided, messages will be added into
+            the pymdt.GlobalErrorLog.
+        undos: Common.Undoing.IUndoPack
+            An optional undo pack into which to load the undoable objects
+            generated during this operation (if any).
+        validate, strict, value_bounds:
+            As for ResetRegularPeriodData and applied to every profile.
+    """
+    if not pymdt.utils.details._is_collection(targets): targets = [targets]
+    targets = list(targets)
+    profiles = np.asarray(profiles, dtype=np.float64)
+    if profiles.ndim == 1:
+        profiles = np.broadcast_to(profiles, (len(targets), profiles.size))
+    if profiles.ndim != 2 or profiles.shape[0] != len(targets):
+        raise ValueError(
+            "Expected one profile per target (" + str(len(targets)) +
+            ") but received an array of shape " + str(profiles.shape) + "."
+            )
+
+    # Don't use kwargs.get to avoid creation of the UndoPack if not needed.
+    kwargs["undos"] = kwargs["undos"] if "undos" in kwargs else \
+        Common.Undoing.UndoPack()
+    kwargs["err_log"] = kwargs.get("err_log", pymdt.GlobalErrorLog)
+
+    # Every profile is checked before any is assigned so that a bad one
+    # leaves all of the targets unchanged.
+    if kwargs.get("validate", True):
+        for rpd, row in zip(targets, profiles):
+            pymdt.core.details._validate_regular_period_data(rpd, row, **kwargs)
+
+    kwargs["validate"] = False
+    for rpd, row in zip(targets, profiles):
+        pymdt.core.ResetRegularPeriodData(rpd, row, **kwargs)
@@ -1,7 +1,9 @@
 import numbers
+import numpy as np
 
 import MDT
 import System
+from System import Exception as SYSEX
 import Common
 
 from enum import Enum
@@ -116,6 +118,75 @@ class details:
             
     currentLog: Common.Logging.Log
 
+    _hours_per_unit = {
+        time_units.milliseconds: 1.0 / 3600000.0,
+        time_units.seconds: 1.0 / 3600.0,
+        time_units.minutes: 1.0 / 60.0,
+        time_units.hours: 1.0,
+        time_units.days: 24.0,
+        time_units.weeks: 168.0,
+        time_units.months: 730.0,
+        time_units.years: 8760.0
+        }
+
+    @staticmethod
+    def _time_units_to_hours(units) -> float:
+        # units may be a time_units member or the underlying
+        # Common.Time.TimeAccumulation.Units value.
+        if isinstance(units, time_units): return details._hours_per_unit[units]
+        for tu in time_units:
+            if tu.value == units: return details._hours_per_unit[tu]
+        raise ValueError("Unrecognized time units " + str(units))
+
+    @staticmethod
+    def _as_float_array(data) -> np.ndarray:
+        # Lists, tuples and arrays convert in bulk.  Anything else iterable
+        # (including .NET collections) is drawn through one item at a time.
+        if isinstance(data, np.ndarray):
+            return np.ascontiguousarray(data, dtype=np.float64).ravel()
+        if not details._is_collection(data): data = [data]
+        if isinstance(data, (list, tuple)):
+            return np.asarray(data, dtype=np.float64).ravel()
+        if hasattr(data, "CopyTo") and hasattr(data, "Count"):
+            return details._net_list_to_array(data)
+        return np.fromiter((float(v) for v in data), dtype=np.float64)
+
+    @staticmethod
+    def _net_list_to_array(lst, out: np.ndarray = None) -> np.ndarray:
+        # Copies a .NET list of doubles into a numpy buffer with two bulk
+        # transfers (list to .NET array and .NET array to numpy memory) rather
+        # than crossing the interop boundary once per element.
+        n = 0 if lst is None else lst.Count
+        if out is None: out = np.empty(n, dtype=np.float64)
+        if n == 0: return out
+        try:
+            arr = System.Array.CreateInstance(System.Double, n)
+            lst.CopyTo(arr, 0)
+            System.Runtime.InteropServices.Marshal.Copy(
+                arr, 0, System.IntPtr(System.Int64(out.ctypes.data)), n
+                )
+        except (SYSEX, AttributeError, TypeError):
+            out[:] = np.fromiter((float(v) for v in lst), np.float64, count=n)
+        return out
+
+    @staticmethod
+    def _array_to_net_list(values: np.ndarray, lst):
+        # The reverse of _net_list_to_array.  Fills the .NET list of doubles
+        # from a numpy buffer using a single .NET array rather than adding the
+        # values one at a time.
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        n = values.size
+        if n == 0: return lst
+        try:
+            arr = System.Array.CreateInstance(System.Double, n)
+            System.Runtime.InteropServices.Marshal.Copy(
+                System.IntPtr(System.Int64(values.ctypes.data)), arr, 0, n
+                )
+            lst.AddRange(arr)
+        except (SYSEX, AttributeError, TypeError):
+            for v in values.tolist(): lst.Add(v)
+        return lst
+
     @staticmethod
     def _log_merge_handler(sender, args):
         if details.currentLog is not None:
@@ -205,6 +276,18 @@ class details:
             into, cancelEvtName, lambda: lst().Add(item, undos), **kwargs
             )
     
+    @staticmethod
+    def _execute_1_arg_remove_with_undo(
+        outof, cancelEvtName, collectionGetterName, item, **kwargs
+        ) -> Common.Logging.Log:
+        
+        lst = getattr(outof, collectionGetterName)
+        # Don't use kwargs.get to avoid creation of the UndoPack if not needed.
+        undos = kwargs["undos"] if "undos" in kwargs else Common.Undoing.UndoPack()
+        return details._execute_loggable_action(
+            outof, cancelEvtName, lambda: lst().Remove(item, undos), **kwargs
+            )
+    
     @staticmethod
     def _execute_1_arg_add(
         into, cancelEvtName, collectionGetterName, item, **kwargs